@@ -0,0 +1,176 @@
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+
+QUERY = "stock-market"
+
+TITLES = [
+    "Stock market rallies as investors weigh rate cuts",
+    "Oil prices slip on weaker demand outlook",
+    "Central bank holds rates steady amid inflation fears",
+    "Tech shares lead gains on Wall Street",
+    "Currency markets react to election results",
+]
+
+SUMMARIES = [
+    "Traders moved $1,250,000 into bonds as markets opened lower.",
+    "Analysts expect growth to slow in the coming quarter.",
+    "The deal is worth 300 million dollars according to filings.",
+    "Officials said the measures would take effect next month.",
+    "Investors bought 25 USD contracts ahead of the announcement.",
+]
+
+MONTHS = [
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+]
+
+
+def news_corpus(size, rng, **options):
+    for number in range(size):
+        yield {
+            "title": rng.choice(TITLES),
+            "description": rng.choice(SUMMARIES),
+            "url": f"https://example.com/news/{QUERY}-story-{number}",
+            "date": f"{rng.randint(1, 28)} {rng.choice(MONTHS)} 2024",
+        }
+
+
+def long_corpus(size, rng, words=800, **options):
+    vocabulary = " ".join(SUMMARIES).replace("$", "").split()
+    for record in news_corpus(size, rng):
+        record["description"] = " ".join(
+            rng.choice(vocabulary) for _ in range(words)
+        )
+        yield record
+
+
+def adversarial_corpus(size, rng, digits=14, **options):
+    for record in news_corpus(size, rng):
+        record["title"] = record["title"].replace("$", "")
+        record["description"] = "1" * digits + " pounds"
+        yield record
+
+
+CORPORA = {
+    "news": news_corpus,
+    "long": long_corpus,
+    "adversarial": adversarial_corpus,
+}
+
+
+def legacy_analyze(record, query):
+    match = re.search(r"([0-9]{1,2} \b\w{3}\b [0-9]{4})", record["date"])
+    datetime.strptime(match.group(1), "%d %b %Y").date()
+    regex = r'(\$(\d{1,3}[.,]{0,1})*)|((\d{1,3}[.,]{0,1})*\s(dollars|USD))'
+    record["count"] = str(record["url"]).count(query)
+    record["matches-currency"] = (
+        bool(re.findall(regex, record["description"]))
+        or bool(re.findall(regex, record["title"]))
+    )
+    return record
+
+
+def legacy_batch(records, query):
+    return [legacy_analyze(record, query) for record in records]
+
+
+def measure(engine, records, repeat):
+    samples = []
+    for _ in range(repeat):
+        batch = [dict(record) for record in records]
+        start = time.perf_counter()
+        engine(batch, QUERY)
+        samples.append(time.perf_counter() - start)
+    best = min(samples)
+    return {
+        "records": len(records),
+        "best_seconds": best,
+        "median_seconds": statistics.median(samples),
+        "records_per_second": len(records) / best if best else None,
+    }
+
+
+def run(args):
+    sys.path.insert(0, str(REPO_DIR))
+    from utils.analytics import TextAnalytics, parse_date
+
+    analytics = TextAnalytics(
+        currency_terms=args.currency_terms,
+        phrases=args.phrases
+    )
+
+    def analytics_batch(records, query):
+        for record in records:
+            parse_date(record["date"])
+        return analytics.analyze_batch(records, query)
+
+    engines = {"legacy": legacy_batch, "analytics": analytics_batch}
+    results = {}
+    for corpus in args.corpora:
+        results[corpus] = {}
+        for size in args.sizes:
+            rng = random.Random(args.seed)
+            records = list(CORPORA[corpus](
+                size, rng, words=args.words, digits=args.digits
+            ))
+            results[corpus][size] = {}
+            for name in args.engines:
+                result = measure(engines[name], records, args.repeat)
+                results[corpus][size][name] = result
+                print(
+                    f"{corpus:>11} {size:>7} {name:>9}: "
+                    f"{result['records_per_second']:12.0f} records/sec",
+                    file=sys.stderr
+                )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure text analytics throughput in records/sec."
+    )
+    parser.add_argument(
+        "--corpora", nargs="+", choices=list(CORPORA), default=list(CORPORA)
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=["legacy", "analytics"],
+        default=["legacy", "analytics"]
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[1000, 10000]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--words", type=int, default=800,
+        help="Words per summary in the long corpus."
+    )
+    parser.add_argument(
+        "--digits", type=int, default=14,
+        help="Digit run length in the adversarial corpus."
+    )
+    parser.add_argument("--currency-terms", nargs="*", default=[])
+    parser.add_argument("--phrases", nargs="*", default=[])
+    parser.add_argument("--output", help="Write results as JSON to a file.")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
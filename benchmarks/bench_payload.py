@@ -0,0 +1,134 @@
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+
+TITLES = [
+    "Stock market rallies as investors weigh rate cuts",
+    "Oil prices slip on weaker demand outlook",
+    "Central bank holds rates steady amid inflation fears",
+    "Tech shares lead gains on Wall Street",
+]
+
+SUMMARIES = [
+    "Traders moved $1,250,000 into bonds as markets opened lower.",
+    "Analysts expect growth to slow in the coming quarter.",
+    "The deal is worth 300 million dollars according to filings.",
+    "Officials said the measures would take effect next month.",
+]
+
+
+def corpus(size, rng):
+    records = []
+    for number in range(size):
+        slug = f"stock-market-story-{number}"
+        records.append({
+            "title": rng.choice(TITLES),
+            "url": f"https://example.com/news/2024/01/01/{slug}",
+            "description": rng.choice(SUMMARIES),
+            "img-alt": "Traders on the floor of the stock exchange",
+            "image": f"https://example.com/imgs/{number}.jpg",
+            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "count": rng.randint(0, 2),
+            "matches-currency": rng.random() < 0.5,
+            "slug": slug,
+            "file": f"output/imgs/{slug}.jpg",
+        })
+    return records
+
+
+def best(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return min(samples), statistics.median(samples)
+
+
+def run(args):
+    sys.path.insert(0, str(REPO_DIR))
+    from utils.article import Article, encode_records, pack_rows
+    from utils.output_batcher import batch_records
+    from utils.sinks import row_from_payload
+
+    results = {}
+    for size in args.sizes:
+        records = corpus(size, random.Random(args.seed))
+        results[size] = {}
+        for encoding in args.encodings:
+            text = json.dumps(encode_records(records, encoding))
+            encode, _ = best(
+                lambda: json.dumps(encode_records(records, encoding)),
+                args.repeat
+            )
+            decode, _ = best(
+                lambda: batch_records(json.loads(text)), args.repeat
+            )
+            decoded = batch_records(json.loads(text))
+            validate, _ = best(
+                lambda: [Article.from_payload(record) for record in decoded],
+                args.repeat
+            )
+            consume, _ = best(
+                lambda: [
+                    row_from_payload(record)
+                    for record in batch_records(json.loads(text))
+                ],
+                args.repeat
+            )
+            result = {
+                "bytes": len(text.encode("utf-8")),
+                "bytes_per_record": len(text.encode("utf-8")) / size,
+                "encode_seconds": encode,
+                "decode_seconds": decode,
+                "decode_records_per_second": size / decode if decode else None,
+                "validate_seconds": validate,
+                "consume_seconds": consume,
+            }
+            if encoding == "msgpack":
+                result["binary_bytes"] = len(pack_rows(records))
+            results[size][encoding] = result
+            print(
+                f"{size:>7} {encoding:>8}: {result['bytes']:>10} bytes, "
+                f"encode {encode * 1000:8.2f} ms, "
+                f"decode {decode * 1000:8.2f} ms, "
+                f"validate {validate * 1000:8.2f} ms, "
+                f"consume {consume * 1000:8.2f} ms",
+                file=sys.stderr
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare work item payload size and parse cost."
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[100, 1000, 10000]
+    )
+    parser.add_argument(
+        "--encodings",
+        nargs="+",
+        choices=["json", "rows", "msgpack"],
+        default=["json", "rows", "msgpack"]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write results as JSON to a file.")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+import argparse
+import functools
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+
+PRODUCER_STAGES = [
+    "start_job",
+    "_Producer__open_chrome",
+    "_Producer__click_search_icon",
+    "_Producer__input_search",
+    "_Producer__send_search_form",
+    "_Producer__sort_search_content",
+    "_Producer__next_page",
+    "_Producer__get_article_info",
+    "_Producer__get_articles_batch",
+    "_Producer__get_article_from_record",
+    "_Producer__emit_outputs",
+]
+
+CONSUMER_STAGES = [
+    "_Consumer__add_data_to_sinks",
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples):
+    return {
+        "count": len(samples),
+        "total": sum(samples),
+        "p50": percentile(samples, 50),
+        "p90": percentile(samples, 90),
+        "p99": percentile(samples, 99),
+    }
+
+
+def peak_rss_mb():
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return {
+        "self": own / scale,
+        "children": children / scale,
+    }
+
+
+class StageTimer():
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, obj, names):
+        for name in names:
+            method = getattr(obj, name, None)
+            if method is not None:
+                setattr(obj, name, self.__timed(name, method))
+
+    def report(self):
+        return {
+            name.split("__")[-1]: summarize(samples)
+            for name, samples in self.samples.items()
+        }
+
+    def __timed(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.samples[name].append(time.perf_counter() - start)
+        return wrapper
+
+
+def configure_env(args, site_url, workdir):
+    os.environ.update({
+        "URL": site_url,
+        "RETRY_MAX": "3",
+        "SHEET_NAME": "data",
+        "LOGGER": "Benchmark",
+        "LOAD_STRATEGY": "eager",
+        "BROWSER_PROFILE": args.profile,
+        "EXTRACTION_MODE": args.extraction,
+        "SEARCH_BACKEND": args.backend,
+        "DOM_PRUNING": args.pruning,
+        "IMG_WORKERS": str(args.img_workers),
+        "INDEX_PATH": "",
+        "IMG_CACHE_PATH": "",
+        "CHECKPOINT_DIR": str(workdir / "checkpoints"),
+        "RC_WORKITEM_ADAPTER": "FileAdapter",
+        "RC_WORKITEM_INPUT_PATH": str(workdir / "consumer-input.json"),
+        "RC_WORKITEM_OUTPUT_PATH": str(workdir / "consumer-output.json"),
+    })
+
+
+def run_worker(args):
+    sys.path.insert(0, str(BENCH_DIR))
+    sys.path.insert(0, str(REPO_DIR))
+    from mock_site import MockNewsSite
+
+    site = MockNewsSite(
+        articles=args.size,
+        page_size=args.page_size,
+        loading_delay=args.loading_delay
+    ).start()
+    workdir = Path(tempfile.mkdtemp(prefix="rpa-news-bench-"))
+    os.chdir(workdir)
+    configure_env(args, site.url, workdir)
+    from news.common import setup_logging
+    from news.consumer import Consumer
+    from news.producer import Producer
+    from utils import METRICS, SessionOutputs
+    setup_logging()
+
+    timer = StageTimer()
+    outputs = SessionOutputs("bench", workdir / "sessions")
+    producer = Producer(
+        payload={"query": args.query, "topic": "bench", "months": 12},
+        outputs=outputs
+    )
+    timer.wrap(producer, PRODUCER_STAGES)
+    producer.init()
+    start = time.perf_counter()
+    producer.start_job()
+    producer.finish_job()
+    produce_time = time.perf_counter() - start
+    producer.session.close()
+
+    with open(workdir / "consumer-input.json", "w") as file:
+        json.dump([{"payload": record} for record in outputs.records], file)
+    consumer = Consumer()
+    timer.wrap(consumer, CONSUMER_STAGES)
+    start = time.perf_counter()
+    consumer.run()
+    consume_time = time.perf_counter() - start
+    site.stop()
+
+    articles = len(outputs.records)
+    return {
+        "size": args.size,
+        "backend": args.backend,
+        "extraction": args.extraction,
+        "articles": articles,
+        "requests": site.requests,
+        "producer_seconds": produce_time,
+        "producer_articles_per_sec": articles / produce_time,
+        "consumer_seconds": consume_time,
+        "consumer_rows_per_sec": articles / consume_time,
+        "stages": timer.report(),
+        "metrics": METRICS.summary(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_sizes(args):
+    results = []
+    for size in args.sizes:
+        command = [
+            sys.executable, __file__, "--worker",
+            "--size", str(size),
+            "--page-size", str(args.page_size),
+            "--loading-delay", str(args.loading_delay),
+            "--backend", args.backend,
+            "--extraction", args.extraction,
+            "--pruning", args.pruning,
+            "--profile", args.profile,
+            "--img-workers", str(args.img_workers),
+            "--query", args.query,
+        ]
+        completed = subprocess.run(
+            command,
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(
+            f"{size:>6} articles: "
+            f"{result['producer_articles_per_sec']:.1f} articles/s produced, "
+            f"{result['consumer_rows_per_sec']:.1f} rows/s consumed, "
+            f"peak RSS {result['peak_rss_mb']['self']:.0f} MB "
+            f"(+{result['peak_rss_mb']['children']:.0f} MB children)",
+            file=sys.stderr
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the producer and consumer against a mock site."
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000]
+    )
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--loading-delay", type=float, default=0.15)
+    parser.add_argument(
+        "--backend", choices=["selenium", "http"], default="selenium"
+    )
+    parser.add_argument(
+        "--extraction", choices=["element", "batch"], default="batch"
+    )
+    parser.add_argument(
+        "--pruning", choices=["off", "collapse", "detach"], default="off"
+    )
+    parser.add_argument(
+        "--profile", choices=["default", "lean"], default="lean"
+    )
+    parser.add_argument("--img-workers", type=int, default=4)
+    parser.add_argument("--query", default="stock market")
+    parser.add_argument("--output", help="Write results as JSON to a file.")
+    parser.add_argument(
+        "--worker", action="store_true", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args)))
+        return
+
+    results = run_sizes(args)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+
+TASKS = {
+    "run_producer": "news.producer",
+    "run_producer_pool": "news.pool",
+    "run_pipeline": "news.pipeline",
+    "run_consumer": "news.consumer",
+}
+
+HEAVY_MODULES = [
+    "selenium",
+    "SeleniumLibrary",
+    "openpyxl",
+    "requests",
+    "pyarrow",
+    "dateutil",
+    "slugify",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from news.common import setup_logging
+setup_logging()
+import {module}
+print(json.dumps({{
+    "import_seconds": time.perf_counter() - start,
+    "modules": len(sys.modules),
+    "heavy": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def probe(module, workdir, env):
+    code = PROBE.format(module=module, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_seconds"] = time.perf_counter() - start
+    return result
+
+
+def baseline(workdir, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], cwd=workdir, env=env)
+    return time.perf_counter() - start
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="rpa-news-startup-")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        path for path in (str(REPO_DIR), env.get("PYTHONPATH")) if path
+    )
+    interpreter = statistics.median(
+        baseline(workdir, env) for _ in range(args.repeat)
+    )
+    results = {"interpreter_seconds": interpreter, "tasks": {}}
+    for name in args.tasks:
+        samples = [
+            probe(TASKS[name], workdir, env) for _ in range(args.repeat)
+        ]
+        results["tasks"][name] = {
+            "import_seconds": statistics.median(
+                sample["import_seconds"] for sample in samples
+            ),
+            "process_seconds": statistics.median(
+                sample["process_seconds"] for sample in samples
+            ),
+            "modules": samples[-1]["modules"],
+            "heavy": samples[-1]["heavy"],
+        }
+        task = results["tasks"][name]
+        print(
+            f"{name:>18}: {task['import_seconds'] * 1000:7.1f} ms imports, "
+            f"{task['process_seconds'] * 1000:7.1f} ms process, "
+            f"{task['modules']} modules, "
+            f"heavy: {', '.join(task['heavy']) or '-'}",
+            file=sys.stderr
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure how long each task takes to start."
+    )
+    parser.add_argument(
+        "--tasks", nargs="+", choices=list(TASKS), default=list(TASKS)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to a file.")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import argparse
+import html
+import struct
+import threading
+import zlib
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+TOPICS = [
+    "Stock market rallies as investors weigh rate cuts",
+    "Oil prices slip on weaker demand outlook",
+    "Central bank holds rates steady amid inflation fears",
+    "Tech shares lead gains on Wall Street",
+    "Currency markets react to election results",
+]
+
+SUMMARIES = [
+    "Traders moved $1,250,000 into bonds as markets opened lower.",
+    "Analysts expect growth to slow in the coming quarter.",
+    "The deal is worth 300 million dollars according to filings.",
+    "Officials said the measures would take effect next month.",
+    "Investors bought 25 USD contracts ahead of the announcement.",
+]
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>Mock News</title></head><body>
+<header class="site-header">
+  <div class="site-header__search-trigger search-trigger">
+    <button type="button"
+      onclick="document.getElementById('search').style.display='block'">
+      Search
+    </button>
+  </div>
+  <form role="search" id="search" action="/search" method="get"
+    style="display:none">
+    <input class="search-bar__input search-bar" name="q" type="text">
+  </form>
+</header>
+<main><h1>Mock News</h1></main>
+<footer class="site-footer">Mock News</footer>
+</body></html>
+"""
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><title>Search - {query}</title></head><body>
+<header class="site-header">
+  <div class="search-trigger"><button type="button">Search</button></div>
+</header>
+<main>
+  <select id="search-sort-option"
+    onchange="location.href='?sort=' + this.value">
+    <option value="relevance"{relevance}>Relevance</option>
+    <option value="date"{date}>Date</option>
+  </select>
+  <div class="search-result__list">{articles}</div>
+  {show_more}
+</main>
+<footer class="site-footer">Mock News</footer>
+<script>
+let page = 1;
+function showMore(button) {{
+  const loading = document.createElement("div");
+  loading.className = "loading-animation";
+  button.after(loading);
+  page += 1;
+  fetch("?sort={sort}&fragment=1&page=" + page)
+    .then(response => response.text())
+    .then(body => new Promise(resolve => setTimeout(() => resolve(body),
+      {loading_delay})))
+    .then(body => {{
+      const list = document.querySelector(".search-result__list");
+      list.insertAdjacentHTML("beforeend", body);
+      loading.remove();
+      if (!body.trim() || page >= {pages}) {{
+        button.remove();
+      }}
+    }});
+}}
+</script>
+</body></html>
+"""
+
+SHOW_MORE = (
+    '<button class="show-more-button grid-full-width" '
+    'onclick="showMore(this)">Show more</button>'
+)
+
+ARTICLE = """<article class="gc u-clickable-card gc--type-post">
+  <div class="gc__content">
+    <div class="gc__header-wrap">
+      <h3 class="gc__title"><a class="u-clickable-card__link" href="{link}">
+        <span>{title}</span></a></h3>
+    </div>
+    <div class="gc__body-wrap"><div class="gc__excerpt">
+      <p>{summary}</p>
+    </div></div>
+    {footer}
+  </div>
+  <div class="gc__image-wrap"><div class="responsive-image">
+    <img class="gc__image" src="{img}" alt="{alt}">
+  </div></div>
+</article>
+"""
+
+FOOTER = """<footer class="gc__footer"><div class="gc__meta">
+      <div class="gc__date"><div class="gc__date__date">
+        <div class="date-simple"><span class="screen-reader-text">
+        Published On {published}</span><span aria-hidden="true">
+        {published}</span></div>
+      </div></div>
+    </div></footer>"""
+
+
+def png_image(seed):
+    def chunk(kind, data):
+        body = kind + data
+        return (
+            struct.pack(">I", len(data))
+            + body
+            + struct.pack(">I", zlib.crc32(body) & 0xffffffff)
+        )
+
+    width = height = 8
+    pixel = bytes([seed % 256, (seed * 7) % 256, (seed * 13) % 256])
+    raw = b"".join(b"\x00" + pixel * width for _ in range(height))
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw))
+        + chunk(b"IEND", b"")
+    )
+
+
+class MockNewsSite():
+    def __init__(
+        self,
+        articles=100,
+        page_size=10,
+        loading_delay=0.15,
+        non_news_every=10,
+        span_days=300,
+        host="127.0.0.1",
+        port=0
+    ):
+        self.articles = articles
+        self.page_size = page_size
+        self.loading_delay = loading_delay
+        self.non_news_every = non_news_every
+        self.span_days = span_days
+        self.server = ThreadingHTTPServer((host, port), self.__handler())
+        self.server.daemon_threads = True
+        self.thread = None
+        self.requests = 0
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def pages(self):
+        return max((self.articles + self.page_size - 1) // self.page_size, 1)
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            name="mock-news-site",
+            daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def article(self, index, query):
+        today = date.today()
+        step = self.span_days / max(self.articles, 1)
+        published = today - timedelta(days=int(index * step))
+        slug = f"{quote(query.replace(' ', '-'))}-story-{index}"
+        link = (
+            f"/news/{published.year}/{published.month}/{published.day}/{slug}"
+        )
+        is_news = not (
+            self.non_news_every and (index + 1) % self.non_news_every == 0
+        )
+        footer = FOOTER.format(
+            published=f"{published.day} {published:%b %Y}"
+        ) if is_news else ""
+        return ARTICLE.format(
+            link=link,
+            title=html.escape(f"{TOPICS[index % len(TOPICS)]} ({index})"),
+            summary=html.escape(SUMMARIES[index % len(SUMMARIES)]),
+            footer=footer,
+            img=f"/imgs/{index}.png",
+            alt=html.escape(f"Illustration {index}")
+        )
+
+    def page(self, query, page):
+        start = (page - 1) * self.page_size
+        end = min(start + self.page_size, self.articles)
+        return "".join(
+            self.article(index, query) for index in range(start, end)
+        )
+
+    def __handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                site.requests += 1
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                if url.path == "/":
+                    return self.__send(HOME_PAGE)
+                if url.path == "/search":
+                    query = params.get("q", [""])[0]
+                    self.send_response(302)
+                    self.send_header("Location", f"/search/{quote(query)}")
+                    self.end_headers()
+                    return
+                if url.path.startswith("/search/"):
+                    return self.__search(unquote(url.path[8:]), params)
+                if url.path.startswith("/imgs/"):
+                    seed = int(url.path[6:].split(".")[0] or 0)
+                    return self.__send(png_image(seed), "image/png")
+                self.send_error(404)
+
+            def __search(self, query, params):
+                sort = params.get("sort", ["relevance"])[0]
+                page = int(params.get("page", ["1"])[0])
+                articles = site.page(query, page)
+                if params.get("fragment"):
+                    return self.__send(articles)
+                return self.__send(SEARCH_PAGE.format(
+                    query=html.escape(query),
+                    sort=sort,
+                    relevance="" if sort == "date" else " selected",
+                    date=" selected" if sort == "date" else "",
+                    articles=articles,
+                    show_more=SHOW_MORE if site.pages > page else "",
+                    pages=site.pages,
+                    loading_delay=int(site.loading_delay * 1000)
+                ))
+
+            def __send(self, body, content_type="text/html; charset=utf-8"):
+                if isinstance(body, str):
+                    body = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a mock news site.")
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--loading-delay", type=float, default=0.15)
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    site = MockNewsSite(
+        articles=args.articles,
+        page_size=args.page_size,
+        loading_delay=args.loading_delay,
+        port=args.port
+    )
+    print(f"Serving {args.articles} articles on {site.url}")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        site.stop()
+
+
+if __name__ == "__main__":
+    main()
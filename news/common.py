@@ -0,0 +1,66 @@
+import os
+from enum import Enum
+
+from dotenv import load_dotenv
+
+from utils import ArticleIndex, configure_logging
+
+load_dotenv("config.env")
+
+
+class Dirs(Enum):
+    OUTPUT = "output"
+    IMGS = f"{OUTPUT}/imgs"
+    SESSIONS = f"{OUTPUT}/sessions"
+
+
+class Timeouts(Enum):
+    SECOND_1 = 1.0
+    SECOND_3 = 3.0
+    SECOND_5 = 5.0
+    SECOND_10 = 10.0
+    SECOND_15 = 15.0
+    SECOND_20 = 20.0
+    SECOND_30 = 30.0
+    SECOND_60 = 60.0
+    SECOND_90 = 90.0
+
+
+class Elements(Enum):
+    SEARCH_ICON = "//header//div[contains(@class, 'search-trigger')]/button"
+    FORM = "//form[@role='search']"
+    SEARCH_BAR = "//input[contains(@class, 'search-bar')]"
+    SORT_SELECTION = "//select[@id='search-sort-option']"
+    ARTICLE = "//article"
+    PENDING_ARTICLE = "//article[not(@data-rpa-done)]"
+    SHOW_MORE = "//button[contains(@class, 'show-more-button')]"
+    LOADING = "//div[@class='loading-animation']"
+    FOOTER = "//footer[@class='site-footer']"
+    RESULTS = "//div[@class='search-result__list']"
+
+
+class EnvSetupError(Exception):
+    pass
+
+
+class SortContentError(Exception):
+    pass
+
+
+class ProducerProcessError(Exception):
+    pass
+
+
+def setup_logging():
+    return configure_logging(f"{Dirs.OUTPUT.value}/log-file.log")
+
+
+def open_article_index():
+    path = os.getenv("INDEX_PATH")
+    if not path:
+        return None
+    return ArticleIndex(
+        path=path,
+        max_age_days=int(os.getenv("INDEX_MAX_AGE_DAYS", 90)),
+        max_entries=int(os.getenv("INDEX_MAX_ENTRIES", 100000))
+    )
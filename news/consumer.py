@@ -0,0 +1,308 @@
+import logging
+import os
+import traceback
+from datetime import datetime
+
+from robocorp import workitems
+
+from utils import (
+    new_counter,
+    batch_records,
+    is_batch,
+    recover_journals,
+    SinkSet,
+    split_sinks,
+    Article,
+    ArticleError,
+    MergeSpool,
+    merge_records,
+    EXCEL_COLUMNS,
+    SAMPLED,
+    METRICS
+)
+from .common import Dirs, Timeouts, EnvSetupError, open_article_index
+
+
+class Consumer():
+    RETRY_MAX = 5
+    LOGGER = logging.getLogger(f"Consumer - {os.getenv('LOGGER')}")
+
+    def __init__(self):
+        self.sinks = None
+        self.sink_names = None
+        self.sheet_name = None
+        self.output_files = None
+        self.sinks_opened = False
+        self.batch_size = None
+        self.flush_interval = None
+        self.row_group_size = None
+        self.merge = False
+        self.spool = None
+        self.merged = set()
+        self.index = None
+        self.unmarked = {}
+        self.wi = workitems
+        self.current_wi = None
+        self.error_counter = new_counter()
+        self.error = 0
+        self.start = datetime.now()
+
+    def init(self):
+        try:
+            self.sheet_name = os.getenv("SHEET_NAME", "data")
+            self.sink_names = split_sinks(os.getenv("OUTPUT_SINKS"))
+            self.batch_size = int(os.getenv("EXCEL_BATCH_SIZE", 500))
+            self.flush_interval = float(
+                os.getenv("EXCEL_FLUSH_INTERVAL", Timeouts.SECOND_30.value)
+            )
+            self.row_group_size = int(
+                os.getenv("PARQUET_ROW_GROUP_SIZE", 10000)
+            )
+            self.merge = os.getenv("CONSUMER_MERGE", "off") == "on"
+            if self.merge and self.spool is None:
+                self.spool = MergeSpool(
+                    os.getenv("MERGE_SPOOL_PATH", "data/merge-spool.jsonl"),
+                    encoding=os.getenv("PAYLOAD_ENCODING", "json"),
+                    logger=self.LOGGER
+                )
+            if self.index is None:
+                self.index = open_article_index()
+            if not self.sinks_opened:
+                self.__recover_excel_files()
+                self.output_files = self.__open_sinks()
+                self.sinks_opened = True
+        except Exception as e:
+            self.LOGGER.error(f"Error initializing environment. {e}")
+            self.LOGGER.error(traceback.format_exc())
+            raise EnvSetupError(
+                f"Error while setting up environment - {type(e)}: {e}"
+            )
+
+    def run(self):
+        ready = False
+        try:
+            self.init()
+            ready = True
+        except EnvSetupError as e:
+            self.LOGGER.error(
+                f"Error initializing Environment for consumer. {e}"
+            )
+
+        if ready:
+            try:
+                self.__consumer()
+            except Exception as e:
+                self.LOGGER.error(f"Error running consumer job. {e}")
+                self.handle_exception(e)
+            else:
+                self.finish_job()
+
+    def handle_exception(self, e):
+        self.LOGGER.error(e)
+        self.error = self.error_counter()
+        if self.error < self.RETRY_MAX:
+            self.run()
+        else:
+            self.finish_job_with_exception(e)
+
+    def finish_job(self):
+        if self.sinks_opened:
+            self.sinks.close()
+            self.sinks_opened = False
+            self.__mark_written()
+        if self.spool is not None:
+            self.spool.clear()
+        self.__close_index()
+        self.__write_metrics()
+
+    def finish_job_with_exception(self, e):
+        if self.sinks_opened:
+            self.sinks.close()
+            self.sinks_opened = False
+            self.__mark_written()
+        self.__close_index()
+        self.__write_metrics()
+
+        self.LOGGER.error(
+            f"After {self.error} attempts, "
+            f"the job was finished with exception: {e}"
+        )
+
+    def __close_index(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def __write_metrics(self):
+        try:
+            files = METRICS.write(Dirs.OUTPUT.value, "consumer")
+        except OSError as e:
+            self.LOGGER.error(f"Unable to write metrics. {e}")
+            return
+        self.LOGGER.info(f"Metrics written to {', '.join(files)}")
+
+    def __recover_excel_files(self):
+        recovered = recover_journals(
+            Dirs.OUTPUT.value,
+            self.sheet_name,
+            EXCEL_COLUMNS,
+            logger=self.LOGGER
+        )
+        for file in recovered:
+            self.LOGGER.info(f"Recovered interrupted excel file {file}.")
+
+    def __open_sinks(self):
+        self.sinks = SinkSet.from_names(
+            self.sink_names,
+            directory=Dirs.OUTPUT.value,
+            file_name=(
+                f"{self.start.strftime('%Y-%m-%d_%H-%M-%S')}-{os.getpid()}"
+            ),
+            logger=self.LOGGER,
+            sheet_name=self.sheet_name,
+            batch_size=self.batch_size,
+            flush_interval=self.flush_interval,
+            row_group_size=self.row_group_size
+        ).open()
+        self.LOGGER.info(f"Writing results to {', '.join(self.sinks.paths)}")
+        return self.sinks.paths
+
+    @METRICS.timed("sink.append")
+    def __add_data_to_sinks(self, obj):
+        slug = obj["slug"]
+        self.sinks.append(obj)
+        self.LOGGER.info(f"Added {slug} to output files.", extra=SAMPLED)
+
+    def __write_record(self, payload):
+        slug = payload["slug"]
+        if self.index and not payload.get("replay") and (
+            slug in self.unmarked or self.index.written(slug)
+        ):
+            self.LOGGER.info(
+                f"{slug} already written, skipping.", extra=SAMPLED
+            )
+            return False
+        self.__add_data_to_sinks(payload)
+        METRICS.count("sink.rows")
+        if self.index:
+            self.unmarked[slug] = payload
+            if (
+                len(self.unmarked) >= self.batch_size
+                and self.sinks.durable_flush
+            ):
+                self.sinks.flush()
+                self.__mark_written()
+        return True
+
+    def __mark_written(self):
+        if self.index is None or not self.unmarked:
+            return
+        marked = self.index.mark_all_written(self.unmarked.values())
+        self.LOGGER.info(f"Marked {marked} saved articles as written.")
+        self.unmarked = {}
+
+    def consume(self, records):
+        try:
+            for payload in records:
+                try:
+                    self.__write_record(payload)
+                except (KeyError, ValueError) as e:
+                    self.LOGGER.error(f"Error processing record: {e}")
+        except Exception as e:
+            self.LOGGER.error(f"Error running consumer stage. {e}")
+            records.abort(e)
+
+    def __consumer(self):
+        if self.merge:
+            self.__spool_inputs()
+            self.__merge_spool()
+            return
+        for item in self.wi.inputs:
+            payload = item.payload
+            if is_batch(payload):
+                self.__consume_batch(item, batch_records(payload))
+            else:
+                self.__consume_record(item, payload)
+
+    def __spool_inputs(self):
+        for item in self.wi.inputs:
+            records = batch_records(item.payload)
+            valid = []
+            failed = []
+            for record in records:
+                try:
+                    Article.from_payload(record)
+                    valid.append(record)
+                except ArticleError as e:
+                    self.LOGGER.error(f"Invalid record {record}: {e}")
+                    failed.append(record)
+            self.spool.append(valid)
+            if not failed:
+                item.done()
+                continue
+            item.payload = {"records": failed}
+            item.save()
+            item.fail(
+                "APPLICATION",
+                "RECORD_FAILED",
+                f"{len(failed)} of {len(records)} records are invalid"
+            )
+
+    def __merge_spool(self):
+        spooled = self.spool.read()
+        records = merge_records(spooled)
+        self.LOGGER.info(
+            f"Merging {len(spooled)} spooled records into "
+            f"{len(records)} unique articles."
+        )
+        METRICS.count("merge.duplicates", len(spooled) - len(records))
+        for record in records:
+            if record["slug"] in self.merged:
+                continue
+            try:
+                self.__write_record(record)
+                self.merged.add(record["slug"])
+            except (KeyError, ValueError) as e:
+                self.LOGGER.error(f"Error processing record: {e}")
+
+    def __consume_record(self, item, payload):
+        try:
+            self.LOGGER.info(
+                f"Started {payload['slug']} work item.", extra=SAMPLED
+            )
+            self.__write_record(payload)
+            self.LOGGER.info(
+                f"{payload['slug']} work item done.", extra=SAMPLED
+            )
+            item.done()
+        except (ValueError, Exception) as e:
+            self.LOGGER.error(
+                f"Error processing work item: {e}"
+            )
+            item.fail(type(e), 2, e)
+
+    def __consume_batch(self, item, records):
+        self.LOGGER.info(
+            f"Started batch work item with {len(records)} records."
+        )
+        failed = []
+        errors = []
+        for record in records:
+            try:
+                self.__write_record(record)
+            except Exception as e:
+                self.LOGGER.error(f"Error processing record: {e}")
+                failed.append(record)
+                errors.append(f"{record.get('slug')}: {type(e).__name__}")
+        if not failed:
+            self.LOGGER.info(f"Batch of {len(records)} records done.")
+            item.done()
+            return
+        item.payload = {"records": failed}
+        item.save()
+        item.fail(
+            "APPLICATION",
+            "RECORD_FAILED",
+            f"{len(failed)} of {len(records)} records failed: "
+            + ", ".join(errors[:10])
+        )
@@ -0,0 +1,71 @@
+import logging
+import os
+import threading
+
+from robocorp import workitems
+
+from utils import new_counter, RecordQueue
+from .common import EnvSetupError
+from .consumer import Consumer
+from .producer import Producer
+
+
+class Pipeline():
+    LOGGER = logging.getLogger(f"Pipeline - {os.getenv('LOGGER')}")
+
+    def __init__(self):
+        self.wi = workitems
+        self.queue_size = int(os.getenv("PIPELINE_QUEUE_SIZE", 100))
+        self.consumer = Consumer()
+        self.records = None
+        self.thread = None
+        self.done_counter = new_counter()
+        self.failed_counter = new_counter()
+        self.done = 0
+        self.failed = 0
+
+    def run(self):
+        try:
+            self.consumer.init()
+        except EnvSetupError as e:
+            self.LOGGER.error(
+                f"Error initializing Environment for consumer. {e}"
+            )
+            return
+        self.records = RecordQueue(self.queue_size, logger=self.LOGGER)
+        self.thread = threading.Thread(
+            target=self.consumer.consume,
+            args=(self.records,),
+            name="pipeline-consumer",
+            daemon=True
+        )
+        self.thread.start()
+        try:
+            for item in self.wi.inputs:
+                self.__produce(item)
+        finally:
+            self.records.close()
+            self.thread.join()
+            if self.records.error is None:
+                self.consumer.finish_job()
+            else:
+                self.consumer.finish_job_with_exception(self.records.error)
+        self.LOGGER.info(
+            f"Pipeline finished: {self.records.created} records, "
+            f"{self.records.blocked} backpressure waits, "
+            f"{self.done} work items done, {self.failed} failed."
+        )
+
+    def __produce(self, item):
+        producer = Producer(payload=item.payload, outputs=self.records)
+        producer.run()
+        if producer.exception is None:
+            item.done()
+            self.done = self.done_counter()
+            return
+        item.fail(
+            "APPLICATION",
+            "PRODUCER_SESSION",
+            f"{type(producer.exception).__name__}: {producer.exception}"
+        )
+        self.failed = self.failed_counter()
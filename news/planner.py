@@ -0,0 +1,103 @@
+import logging
+import os
+
+from robocorp import workitems
+from slugify import slugify
+
+from utils import (
+    new_counter,
+    plan_shards,
+    month_windows,
+    find_last_page,
+    page_ranges,
+    shard_queries,
+    retry,
+    RetryPolicy,
+    HttpSearchBackend,
+    is_retryable,
+    parse_date
+)
+from .common import Timeouts
+
+
+class Planner():
+    LOGGER = logging.getLogger(f"Planner - {os.getenv('LOGGER')}")
+    HTTP_POLICY = RetryPolicy.from_env(base_delay=1.0, classify=is_retryable)
+
+    def __init__(self):
+        self.wi = workitems
+        self.window_months = int(os.getenv("PLANNER_WINDOW_MONTHS", 0))
+        self.page_shards = int(os.getenv("PLANNER_PAGE_SHARDS", 4))
+        self.max_pages = int(os.getenv("PLANNER_MAX_PAGES", 10000))
+        self.search = None
+        self.shard_counter = new_counter()
+        self.shards = 0
+
+    def run(self):
+        try:
+            for item in self.wi.inputs:
+                try:
+                    shards = plan_shards(
+                        item.payload,
+                        self.window_months,
+                        pages=self.__page_ranges(item.payload)
+                    )
+                    for shard in shards:
+                        self.wi.outputs.create(payload=shard)
+                        self.shards = self.shard_counter()
+                    item.done()
+                    self.LOGGER.info(
+                        f"Split {item.payload['query']} into "
+                        f"{len(shards)} shards."
+                    )
+                except Exception as e:
+                    self.LOGGER.error(f"Error planning work item: {e}")
+                    item.fail("APPLICATION", "PLANNER", str(e))
+        finally:
+            if self.search is not None:
+                self.search.close()
+        self.LOGGER.info(f"Planner created {self.shards} shards.")
+
+    def __page_ranges(self, payload):
+        if self.page_shards < 2:
+            return None
+        if self.search is None:
+            self.search = HttpSearchBackend(
+                url_template=os.getenv(
+                    "SEARCH_URL_TEMPLATE",
+                    "{url}/search/{query}?sort=date&page={page}"
+                ),
+                base_url=os.getenv("URL"),
+                timeout=Timeouts.SECOND_15.value,
+                logger=self.LOGGER
+            )
+        oldest = month_windows(payload["months"], 0)[0][0]
+        return {
+            query: page_ranges(
+                self.__last_page(query, oldest),
+                self.page_shards
+            )
+            for query in shard_queries(payload)
+        }
+
+    def __last_page(self, query, oldest):
+        fetch = retry(logger=self.LOGGER, policy=self.HTTP_POLICY)(
+            self.search.fetch_page
+        )
+        search = slugify(query).replace("-", " ")
+
+        def in_range(page):
+            records = fetch(search, page)
+            dates = []
+            for record in records:
+                try:
+                    dates.append(parse_date(record["date"] or ""))
+                except ValueError:
+                    continue
+            return bool(records) and (not dates or max(dates) >= oldest)
+
+        last_page = find_last_page(in_range, self.max_pages)
+        self.LOGGER.info(
+            f"{query} has {last_page} results pages since {oldest}."
+        )
+        return last_page
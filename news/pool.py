@@ -0,0 +1,106 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from robocorp import workitems
+
+from utils import (
+    BrowserSession,
+    new_counter,
+    OutputBatcher,
+    read_input_payloads
+)
+from .common import Dirs, ProducerProcessError
+from .producer import run_producer_session
+
+
+class ProducerPool():
+    LOGGER = logging.getLogger(f"ProducerPool - {os.getenv('LOGGER')}")
+
+    def __init__(self):
+        self.wi = workitems
+        self.size = int(os.getenv("POOL_SIZE", 2))
+        self.mode = os.getenv("POOL_MODE", "process")
+        self.batch_size = int(os.getenv("OUTPUT_BATCH_SIZE", 100))
+        self.payload_encoding = os.getenv("PAYLOAD_ENCODING", "json")
+        self.done_counter = new_counter()
+        self.failed_counter = new_counter()
+        self.done = 0
+        self.failed = 0
+
+    def run(self):
+        os.makedirs(Dirs.SESSIONS.value, exist_ok=True)
+        payloads = read_input_payloads()
+        if payloads is None:
+            self.LOGGER.warning(
+                "Input payloads not readable ahead of reservation and only "
+                "one input can be reserved at a time, so sessions run one "
+                "after another in this process. Use the FileAdapter or "
+                "several robot runs to crawl in parallel."
+            )
+            for session, item in enumerate(self.wi.inputs):
+                self.__release(item, item.payload, partial(
+                    run_producer_session, session, item.payload
+                ))
+        else:
+            self.LOGGER.info(
+                f"Dispatching {len(payloads)} work items to "
+                f"{self.size} {self.mode} sessions."
+            )
+            with self.__executor() as executor:
+                futures = [
+                    executor.submit(run_producer_session, session, payload)
+                    for session, payload in enumerate(payloads)
+                ]
+                for item, payload, future in zip(
+                    self.wi.inputs, payloads, futures
+                ):
+                    self.__release(item, payload, future.result)
+
+        self.LOGGER.info(
+            f"Pool finished: {self.done} work items done, "
+            f"{self.failed} failed."
+        )
+
+    def __executor(self):
+        if self.mode == "thread":
+            return ThreadPoolExecutor(
+                max_workers=self.size,
+                thread_name_prefix="producer-session"
+            )
+        return ProcessPoolExecutor(
+            max_workers=self.size,
+            initializer=BrowserSession.close_at_exit
+        )
+
+    def __release(self, item, payload, session_result):
+        try:
+            if item.payload != payload:
+                raise ProducerProcessError(
+                    f"Work item payload {item.payload} does not match "
+                    f"dispatched payload {payload}"
+                )
+            result = session_result()
+            batcher = OutputBatcher(
+                self.wi.outputs,
+                batch_size=self.batch_size,
+                flush_interval=float("inf"),
+                encoding=self.payload_encoding,
+                logger=self.LOGGER
+            )
+            for record in result["records"]:
+                batcher.add(record)
+            batcher.close()
+            if result["error"]:
+                raise ProducerProcessError(result["error"])
+            item.done()
+            self.LOGGER.info(
+                f"Session {result['session']} done with "
+                f"{len(result['records'])} articles."
+            )
+            self.done = self.done_counter()
+        except Exception as e:
+            self.LOGGER.error(f"Error processing work item: {e}")
+            item.fail("APPLICATION", "PRODUCER_SESSION", str(e))
+            self.failed = self.failed_counter()
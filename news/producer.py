@@ -0,0 +1,1076 @@
+import glob
+import logging
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future
+from datetime import date, datetime
+
+from dateutil.relativedelta import relativedelta
+from robocorp import workitems
+from slugify import slugify
+
+from utils import (
+    retry,
+    RetryPolicy,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudgetExceeded,
+    caused_by,
+    new_counter,
+    ImageDownloader,
+    EXTRACT_ARTICLES_JS,
+    PRUNE_ARTICLES_JS,
+    HttpSearchBackend,
+    is_retryable,
+    SessionOutputs,
+    OutputBatcher,
+    PipelineAborted,
+    slug_from_url,
+    ImageCache,
+    Checkpoint,
+    BrowserSession,
+    build_profile,
+    lazy_import,
+    AdaptiveTimeouts,
+    SnapshotArchive,
+    SnapshotSearchBackend,
+    TextAnalytics,
+    Article,
+    ArticleError,
+    load_msgpack,
+    ENCODINGS,
+    parse_date,
+    SAMPLED,
+    METRICS,
+    PROFILER
+)
+from .common import (
+    Dirs,
+    Timeouts,
+    Elements,
+    EnvSetupError,
+    SortContentError,
+    ProducerProcessError,
+    open_article_index
+)
+
+selenium = lazy_import("RPA.Browser.Selenium")
+
+
+def is_retryable_browser_error(error):
+    exceptions = sys.modules.get("selenium.common.exceptions")
+    if exceptions is None:
+        return None
+    if isinstance(error, (
+        exceptions.InvalidSessionIdException,
+        exceptions.NoSuchWindowException
+    )):
+        return False
+    return None
+
+
+def run_producer_session(session, payload):
+    outputs = SessionOutputs(session, Dirs.SESSIONS.value)
+    producer = Producer(
+        payload=payload,
+        outputs=outputs,
+        job=f"producer-{os.getpid()}"
+    )
+    producer.run()
+    error = producer.exception
+    return {
+        "session": session,
+        "records": outputs.records,
+        "error": f"{type(error).__name__}: {error}" if error else None,
+    }
+
+
+class Producer():
+    RETRY_MAX = 5
+    LOGGER = logging.getLogger(f"Producer - {os.getenv('LOGGER')}")
+    BREAKER = CircuitBreaker(
+        "site",
+        threshold=int(os.getenv("CIRCUIT_THRESHOLD", 10)),
+        reset_timeout=float(os.getenv("CIRCUIT_RESET_TIMEOUT", 60)),
+        logger=LOGGER
+    )
+    RETRY_POLICY = RetryPolicy.from_env(
+        breaker=BREAKER,
+        abort_on=(PipelineAborted,),
+        classify=is_retryable_browser_error
+    )
+    BROWSER_POLICY = RETRY_POLICY.replace(
+        base_delay=2.0,
+        abort_on=(PipelineAborted,),
+        classify=None
+    )
+    PAGE_POLICY = RETRY_POLICY.replace(base_delay=1.0)
+    HTTP_POLICY = RETRY_POLICY.replace(base_delay=1.0, classify=is_retryable)
+
+    def __init__(self, payload=None, outputs=None, job="producer"):
+        self.RETRY_MAX = None
+        self.job = job
+        self.session = BrowserSession.current(self.LOGGER)
+        self.limit_date = None
+        self.until_date = None
+        self.shard = None
+        self.first_page = 1
+        self.last_page = None
+        self.start = datetime.now()
+        self.error_counter = new_counter()
+        self.error = 0
+        self.wait_time = Timeouts.SECOND_5.value
+        self.implicit_wait = None
+        self.timeouts = None
+        self.timeout = Timeouts.SECOND_15.value
+        self.page_load = Timeouts.SECOND_30.value
+        self.load_strategy = None
+        self.browser_profile = None
+        self.url = None
+        self.query = None
+        self.topic = None
+        self.months = None
+        self.article_counter = new_counter()
+        self.articles = 0
+        self.should_stop = False
+        self.chrome_opened = False
+        self.curr_idx = 1
+        self.pages = 0
+        self.checkpoint = None
+        self.emitted = deque(maxlen=int(os.getenv("CHECKPOINT_SLUGS", 1000)))
+        self.resumed = set()
+        self.resume_pages = 0
+        self.wi = workitems
+        self.current_wi = None
+        self.payload = payload
+        self.outputs = outputs if outputs is not None else self.wi.outputs
+        self.batch_outputs = outputs is None
+        self.batcher = None
+        self.output_batch_size = None
+        self.output_flush_interval = None
+        self.exception = None
+        self.img_workers = None
+        self.extraction_mode = None
+        self.dom_pruning = None
+        self.search_backend = None
+        self.search_url_template = None
+        self.http_search = None
+        self.snapshots = None
+        self.snapshot_images = None
+        self.archive = None
+        self.analytics = None
+        self.payload_encoding = None
+        self.index = None
+        self.downloader = None
+        self.pending = deque()
+
+    @property
+    def driver(self):
+        return self.session.driver
+
+    def set_config(self):
+        try:
+            retry = os.getenv("RETRY_MAX", 3)
+            self.RETRY_MAX = int(retry)
+            self.url = os.getenv("URL")
+            self.load_strategy = os.getenv("LOAD_STRATEGY", "normal")
+            self.implicit_wait = float(
+                os.getenv("IMPLICIT_WAIT", self.wait_time)
+            )
+            self.browser_profile = build_profile(
+                os.getenv("BROWSER_PROFILE", "default"),
+                os.getenv("BLOCKED_RESOURCES"),
+                os.getenv("BLOCKED_DOMAINS")
+            )
+            self.img_workers = int(os.getenv("IMG_WORKERS", 4))
+            self.extraction_mode = os.getenv("EXTRACTION_MODE", "element")
+            self.dom_pruning = os.getenv("DOM_PRUNING", "off")
+            self.search_backend = os.getenv("SEARCH_BACKEND", "selenium")
+            if self.__paged() and self.search_backend == "selenium":
+                self.LOGGER.info(
+                    "Page range shards are crawled with the HTTP backend."
+                )
+                self.search_backend = "http"
+            self.search_url_template = os.getenv(
+                "SEARCH_URL_TEMPLATE",
+                "{url}/search/{query}?sort=date&page={page}"
+            )
+            self.analytics = TextAnalytics.from_env()
+            self.payload_encoding = os.getenv("PAYLOAD_ENCODING", "json")
+            if self.payload_encoding not in ENCODINGS:
+                raise ValueError(
+                    f"Unknown payload encoding {self.payload_encoding}"
+                )
+            if self.payload_encoding == "msgpack":
+                load_msgpack()
+            self.snapshots = os.getenv("SNAPSHOTS", "off")
+            self.snapshot_images = os.getenv("SNAPSHOT_IMAGES", "off")
+            self.output_batch_size = int(
+                os.getenv("OUTPUT_BATCH_SIZE", 100)
+            ) if self.batch_outputs else 1
+            self.output_flush_interval = float(
+                os.getenv("OUTPUT_FLUSH_INTERVAL", Timeouts.SECOND_10.value)
+            )
+            self.LOGGER.info("Variables and configs set up.")
+        except Exception as e:
+            self.LOGGER.error(f"Error setting up configs. {e}")
+            self.LOGGER.error(traceback.format_exc())
+            raise EnvSetupError(
+                f"Error while setting up environment - {type(e)}: {e}"
+            )
+
+    def set_env(self):
+        try:
+            self.set_config()
+            self.__create_dirs()
+            self.__start_downloader()
+            self.__start_batcher()
+            self.__start_timeouts()
+            if self.index is None:
+                self.index = open_article_index()
+            self.__start_archive()
+            if self.search_backend in ("http", "snapshot"):
+                self.__start_http_search()
+            else:
+                self.__start_browser()
+            if self.search_backend == "snapshot":
+                self.__start_replay()
+            self.limit_date = self.__get_limit_date()
+            if self.payload.get("since"):
+                self.limit_date = date.fromisoformat(self.payload["since"])
+            self.LOGGER.info("Environment set up.")
+        except Exception as e:
+            self.LOGGER.error(f"Error setting up environment. {e}")
+            self.LOGGER.error(traceback.format_exc())
+            raise EnvSetupError(
+                f"Error while setting up environment - {type(e)}: {e}"
+            )
+
+    def init(self):
+        try:
+            if self.payload is None:
+                self.current_wi = self.wi.inputs.current
+                self.payload = self.current_wi.payload
+            payload = self.payload
+            self.query = slugify(payload["query"])
+            self.topic = payload["topic"]
+            self.months = int(payload["months"])
+            self.shard = payload.get("shard")
+            self.first_page = int(payload.get("first_page") or 1)
+            if payload.get("last_page"):
+                self.last_page = int(payload["last_page"])
+            if payload.get("until"):
+                self.until_date = date.fromisoformat(payload["until"])
+            self.set_env()
+            self.__restore_checkpoint()
+            if self.shard:
+                self.LOGGER.info(
+                    f"Processing shard {self.shard} from {self.limit_date} "
+                    f"to {self.until_date}, pages {self.first_page} "
+                    f"to {self.last_page or 'end'}."
+                )
+            self.LOGGER.info("Environment initialized.")
+        except Exception as e:
+            self.LOGGER.error(f"Error initializing environment. {e}")
+            self.LOGGER.error(traceback.format_exc())
+            raise EnvSetupError(
+                f"Error while setting up environment - {type(e)}: {e}"
+            )
+
+    def run(self):
+        while True:
+            try:
+                self.init()
+            except EnvSetupError as e:
+                self.exception = e
+                self.LOGGER.error(
+                    f"Error initializing Environment for producer. {e}"
+                )
+                return
+
+            try:
+                self.start_job()
+                if self.current_wi is not None:
+                    self.current_wi.done()
+            except Exception as e:
+                self.LOGGER.error(f"Error running producer job. {e}")
+                if self.handle_exception(e):
+                    continue
+            else:
+                self.finish_job()
+            return
+
+    def stop(self):
+        self.LOGGER.info("Automation must stop processing.")
+        self.should_stop = True
+
+    def start_job(self):
+        self.LOGGER.info("Started job execution")
+        if self.search_backend == "snapshot":
+            self.__http_producer()
+            return
+        if self.search_backend == "http":
+            try:
+                self.__http_producer()
+                return
+            except Exception as e:
+                if self.__paged() or caused_by(e, (
+                    PipelineAborted,
+                    CircuitOpenError,
+                    RetryBudgetExceeded
+                )):
+                    raise
+                self.LOGGER.warning(
+                    f"HTTP search backend failed, falling back to browser. {e}"
+                )
+                self.__start_browser()
+        self.pages = 0
+        self.__click_search_icon()
+        self.__input_search()
+        self.__send_search_form()
+        self.__sort_search_content()
+        if self.curr_idx > 1:
+            self.__reach_to_current_article()
+        self.__producer()
+
+    def finish_job(self):
+        self.__stop_downloader()
+        self.__write_metrics()
+        self.__save_timeouts()
+        self.__stop_http_search()
+        if self.index is not None:
+            self.index.compact()
+        self.__close_index()
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+
+        self.LOGGER.info(
+            f"Automation read {self.articles} articles"
+        )
+
+    def __get_limit_date(self):
+        months = int(self.months)
+        current_date = self.start
+        delta = months - 1 if months - 1 >= 0 else 0
+        limit_date = current_date - relativedelta(months=delta)
+        first_day_of_month = limit_date.replace(day=1)
+        return first_day_of_month.date()
+
+    def __start_downloader(self):
+        if self.downloader is None:
+            self.downloader = ImageDownloader(
+                img_dir=Dirs.IMGS.value,
+                workers=self.img_workers,
+                retry_max=self.RETRY_MAX,
+                timeout=self.timeout,
+                cache=self.__open_image_cache(),
+                logger=self.LOGGER
+            )
+
+    def __open_image_cache(self):
+        path = os.getenv("IMG_CACHE_PATH")
+        if not path:
+            return None
+        return ImageCache(
+            path=path,
+            directory=Dirs.IMGS.value,
+            max_bytes=int(os.getenv("IMG_CACHE_MAX_MB", 512)) * 1024 * 1024,
+            logger=self.LOGGER
+        )
+
+    def __start_timeouts(self):
+        if self.timeouts is None:
+            self.timeouts = AdaptiveTimeouts(
+                path=os.getenv("TIMEOUTS_PATH", "data/timeouts.json"),
+                margin=float(os.getenv("TIMEOUT_MARGIN", 2.0)),
+                percentile=int(os.getenv("TIMEOUT_PERCENTILE", 95)),
+                min_samples=int(os.getenv("TIMEOUT_MIN_SAMPLES", 5)),
+                enabled=os.getenv("ADAPTIVE_TIMEOUTS", "on") != "off",
+                logger=self.LOGGER
+            )
+
+    def __save_timeouts(self):
+        if self.timeouts is None:
+            return
+        try:
+            self.timeouts.save()
+        except OSError as e:
+            self.LOGGER.warning(f"Could not save learned timeouts. {e}")
+
+    def __wait_for(self, key, locator, default, present=True):
+        timeout = self.timeouts.timeout(key, default)
+        with self.timeouts.measure(key, timeout):
+            if present:
+                self.driver.wait_until_page_contains_element(
+                    locator=locator,
+                    timeout=timeout
+                )
+            else:
+                self.driver.wait_until_page_does_not_contain_element(
+                    locator=locator,
+                    timeout=timeout
+                )
+
+    def __stop_downloader(self):
+        if self.downloader is not None:
+            self.downloader.close()
+            self.downloader = None
+
+    def __start_browser(self):
+        self.__open_chrome()
+        self.chrome_opened = True
+
+    def __start_archive(self):
+        if self.archive is None and (
+            self.snapshots != "off" or self.search_backend == "snapshot"
+        ):
+            self.archive = SnapshotArchive(
+                os.getenv("SNAPSHOT_DIR", "data/snapshots"),
+                run=os.getenv("SNAPSHOT_RUN") or self.start.strftime("%Y%m%d"),
+                logger=self.LOGGER
+            )
+
+    def __start_http_search(self):
+        if self.http_search is not None:
+            return
+        if self.search_backend == "snapshot":
+            self.http_search = SnapshotSearchBackend(
+                self.archive,
+                run=self.payload.get("run") or os.getenv("SNAPSHOT_RUN"),
+                logger=self.LOGGER
+            )
+            return
+        self.http_search = HttpSearchBackend(
+            url_template=self.search_url_template,
+            base_url=self.url,
+            timeout=self.timeout,
+            archive=self.archive if self.snapshots != "off" else None,
+            logger=self.LOGGER
+        )
+
+    def __start_replay(self):
+        run = self.http_search.resolve(self.query)
+        self.start = self.archive.captured(self.query, run)
+        self.LOGGER.info(f"Replaying snapshot run {run} from {self.start}.")
+
+    def __paged(self):
+        return self.first_page > 1 or self.last_page is not None
+
+    def __pages_key(self):
+        if not self.__paged():
+            return ""
+        return f"-pages-{self.first_page}-{self.last_page or 'end'}"
+
+    def __replay_key(self):
+        if self.search_backend != "snapshot":
+            return ""
+        return f"-snapshot-{self.http_search.run}"
+
+    def __archive_page(self):
+        if self.snapshots == "off" or self.archive is None:
+            return
+        try:
+            with METRICS.timer("page.archive"):
+                self.archive.save(
+                    self.query,
+                    self.pages + 1,
+                    self.driver.get_source(),
+                    self.driver.get_location()
+                )
+        except Exception as e:
+            self.LOGGER.warning(f"Could not archive page {self.pages}. {e}")
+
+    def __stop_http_search(self):
+        if self.http_search is not None:
+            self.http_search.close()
+            self.http_search = None
+
+    def __close_index(self):
+        if self.index is not None:
+            self.index.close()
+            self.index = None
+
+    def __is_indexed(self, link):
+        if self.index is None or self.search_backend == "snapshot":
+            return False
+        date = self.index.seen(slug_from_url(link))
+        if date is None:
+            return False
+        if datetime.strptime(date, "%Y-%m-%d").date() < self.limit_date:
+            self.LOGGER.info(
+                f"Article {link} is out of date range.", extra=SAMPLED
+            )
+            self.stop()
+        else:
+            self.LOGGER.info(
+                f"Article {link} already indexed, skipping.", extra=SAMPLED
+            )
+        return True
+
+    def __write_metrics(self):
+        try:
+            files = METRICS.write(Dirs.OUTPUT.value, self.job)
+        except OSError as e:
+            self.LOGGER.error(f"Unable to write metrics. {e}")
+            return
+        self.LOGGER.info(f"Metrics written to {', '.join(files)}")
+
+    def __restore_checkpoint(self):
+        if self.checkpoint is None:
+            max_age = float(os.getenv("CHECKPOINT_MAX_AGE", 24)) * 3600
+            self.checkpoint = Checkpoint(
+                os.getenv("CHECKPOINT_DIR", "data/checkpoints"),
+                slugify(
+                    f"{self.query}-{self.topic}-{self.months}"
+                    f"-{self.payload.get('since', '')}"
+                    f"-{self.payload.get('until', '')}"
+                    f"{self.__pages_key()}"
+                    f"{self.__replay_key()}"
+                ),
+                run=getattr(self.current_wi, "id", None),
+                max_age=max_age or None
+            )
+        state = self.checkpoint.load()
+        if state is None:
+            return
+        self.curr_idx = state["index"]
+        self.emitted = deque(state["slugs"], maxlen=self.emitted.maxlen)
+        self.resumed = set(self.emitted)
+        self.resume_pages = state["pages"]
+        self.articles = state["articles"]
+        self.article_counter = new_counter(self.articles)
+        self.LOGGER.info(
+            f"Resuming from article {self.curr_idx} on page "
+            f"{self.resume_pages} ({self.articles} articles already emitted)."
+        )
+
+    def __start_batcher(self):
+        if self.batcher is None:
+            self.batcher = OutputBatcher(
+                self.outputs,
+                batch_size=self.output_batch_size,
+                flush_interval=self.output_flush_interval,
+                on_flush=self.__commit_outputs,
+                encoding=self.payload_encoding,
+                logger=self.LOGGER
+            )
+
+    def __commit_outputs(self, entries):
+        for obj, index in entries:
+            if self.index is not None:
+                self.index.put(obj)
+            self.emitted.append(obj["slug"])
+            self.articles = self.article_counter()
+        self.__save_checkpoint(entries[-1][1])
+
+    def __save_checkpoint(self, index):
+        self.checkpoint.save(
+            index=index,
+            slugs=list(self.emitted),
+            pages=self.pages,
+            articles=self.articles
+        )
+
+    def __is_emitted(self, link):
+        if slug_from_url(link) in self.resumed:
+            self.LOGGER.info(
+                f"Article {link} emitted before, skipping.", extra=SAMPLED
+            )
+            return True
+        return False
+
+    def __download_img(self, link, file_name):
+        if self.search_backend == "snapshot" and self.snapshot_images == "off":
+            skipped = Future()
+            skipped.set_result(self.__stored_image(link, file_name))
+            return skipped
+        return self.downloader.submit(link, file_name)
+
+    def __stored_image(self, link, file_name):
+        cache = self.downloader.cache
+        entry = cache.lookup(link) if cache is not None and link else None
+        if entry is not None:
+            return entry["path"]
+        record = self.index.get(file_name) if self.index is not None else None
+        if record and record.get("file") and os.path.isfile(record["file"]):
+            return record["file"]
+        existing = sorted(glob.glob(f"{Dirs.IMGS.value}/{file_name}.*"))
+        return existing[0] if existing else None
+
+    def __emit_outputs(self, wait=False):
+        max_pending = self.img_workers * 4
+        while self.pending and (
+            wait
+            or self.pending[0][1].done()
+            or len(self.pending) > max_pending
+        ):
+            article, download, index = self.pending.popleft()
+            try:
+                article.file = download.result() or ""
+            except Exception as e:
+                self.LOGGER.error(
+                    f"Image download failed for {article.slug}: {e}"
+                )
+                article.file = ""
+            self.batcher.add(article.to_payload(), index)
+            METRICS.count("articles.emitted")
+        if wait:
+            self.batcher.flush()
+
+    @METRICS.timed("page.next")
+    @retry(logger=LOGGER, policy=PAGE_POLICY)
+    def __next_page(self):
+        if self.driver.does_page_contain_element(
+            locator=Elements.SHOW_MORE.value
+        ):
+            self.driver.scroll_element_into_view(Elements.FOOTER.value)
+            with PROFILER.track("page.next"):
+                self.driver.wait_and_click_button(Elements.SHOW_MORE.value)
+                self.__wait_for(
+                    "loading.shown",
+                    Elements.LOADING.value,
+                    Timeouts.SECOND_10.value
+                )
+                self.__wait_for(
+                    "loading.gone",
+                    Elements.LOADING.value,
+                    Timeouts.SECOND_10.value,
+                    present=False
+                )
+            self.pages += 1
+            self.__archive_page()
+            self.LOGGER.info("Next page loaded.")
+            return True
+        else:
+            self.LOGGER.info("Could not load next page.")
+            return False
+
+    def __validate_url(self):
+        if not self.driver.is_location(self.url):
+            self.LOGGER.info(f"Navigating to {self.url}")
+            self.driver.go_to(self.url)
+            return self.driver.is_location(self.url)
+        self.LOGGER.info(f"Driver in correct url: {self.url}")
+        return True
+
+    @METRICS.timed("search.click_icon")
+    @retry(logger=LOGGER, policy=RETRY_POLICY)
+    def __click_search_icon(self):
+        try:
+            self.driver.click_element_when_clickable(
+                Elements.SEARCH_ICON.value,
+                timeout=Timeouts.SECOND_5.value
+            )
+            self.__wait_for(
+                "search.bar",
+                Elements.SEARCH_BAR.value,
+                Timeouts.SECOND_5.value
+            )
+            assert self.driver.does_page_contain_element(
+                Elements.SEARCH_BAR.value
+            )
+            self.LOGGER.info("clicked search icon.")
+        except AssertionError as e:
+            self.driver.go_to(self.url)
+            self.driver.maximize_browser_window()
+            self.__wait_for(
+                "search.icon",
+                Elements.SEARCH_ICON.value,
+                Timeouts.SECOND_10.value
+            )
+            self.LOGGER.error(traceback.format_exc())
+            raise e
+
+    @METRICS.timed("search.input")
+    @retry(logger=LOGGER, policy=RETRY_POLICY)
+    def __input_search(self):
+        self.driver.input_text(
+            Elements.SEARCH_BAR.value,
+            self.query.replace("-", " ")
+        )
+        assert self.driver.get_value(
+            Elements.SEARCH_BAR.value
+        ) == self.query.replace("-", " ")
+        self.LOGGER.info("Query typed in search-bar")
+
+    @METRICS.timed("search.submit")
+    @retry(logger=LOGGER, policy=RETRY_POLICY)
+    def __send_search_form(self):
+        try:
+            self.driver.submit_form(Elements.FORM.value)
+            self.LOGGER.info(f"Searched for {self.query}")
+            self.__wait_for(
+                "search.results",
+                Elements.RESULTS.value,
+                Timeouts.SECOND_20.value
+            )
+            self.LOGGER.info("Search results loaded.")
+        except AssertionError as e:
+            self.__input_search()
+            self.LOGGER.error(traceback.format_exc())
+            raise e
+
+    def __create_dirs(self):
+        for dir in Dirs:
+            os.makedirs(name=dir.value, mode=0o777, exist_ok=True)
+
+    @METRICS.timed("browser.open")
+    @retry(logger=LOGGER, policy=BROWSER_POLICY)
+    def __open_chrome(self):
+        try:
+            opts = {
+                "arguments": self.browser_profile["arguments"],
+                "capabilities": {
+                    "pageLoadStrategy": self.load_strategy,
+                    "timeouts": {
+                        "implicit": self.implicit_wait * 1000,
+                        "pageLoad": self.page_load * 1000,
+                        "script": self.timeout * 1000,
+                    }
+                }
+            }
+            self.LOGGER.debug("Browser options set up.")
+            self.session.ensure_open(
+                url=self.url,
+                options=opts,
+                ready_locator=Elements.SEARCH_ICON.value,
+                timeout=self.page_load,
+                profile=self.browser_profile
+            )
+            self.LOGGER.debug("Browser ready")
+            assert self.__validate_url()
+            self.LOGGER.debug("Browser URL validated")
+        except AssertionError as e:
+            self.session.close()
+            self.LOGGER.error(traceback.format_exc())
+            raise e
+
+    @METRICS.timed("search.sort")
+    @retry(logger=LOGGER, policy=RETRY_POLICY)
+    def __sort_search_content(self):
+        try:
+            self.__wait_for(
+                "sort.selection",
+                Elements.SORT_SELECTION.value,
+                Timeouts.SECOND_5.value
+            )
+            self.driver.select_from_list_by_value(
+                Elements.SORT_SELECTION.value,
+                "date"
+            )
+            self.__wait_for(
+                "sort.results",
+                Elements.RESULTS.value,
+                Timeouts.SECOND_10.value
+            )
+            assert self.driver.get_selected_list_value(
+                Elements.SORT_SELECTION.value
+            ) == "date"
+            self.LOGGER.info("Sorted results by date.")
+        except selenium.ElementNotFound as e:
+            self.driver.reload_page()
+            self.LOGGER.error(traceback.format_exc())
+            raise SortContentError(f"{type(e)}: {e}") from e
+
+        except Exception as e:
+            self.LOGGER.error(traceback.format_exc())
+            raise SortContentError(f"{type(e)}: {e}") from e
+
+    @METRICS.timed("producer.extract")
+    @retry(logger=LOGGER, policy=RETRY_POLICY)
+    def __producer(self):
+        try:
+            self.__wait_for(
+                "producer.results",
+                Elements.RESULTS.value,
+                Timeouts.SECOND_10.value
+            )
+            self.__archive_page()
+            if self.extraction_mode == "batch":
+                self.__produce_batch()
+            else:
+                self.__produce_by_element()
+
+        except selenium.ElementNotFound as e:
+            self.driver.reload_page()
+            self.__reach_to_current_article()
+            self.LOGGER.error(traceback.format_exc())
+            raise ProducerProcessError(f"{type(e)}: {e}") from e
+
+        except Exception as e:
+            self.LOGGER.error(traceback.format_exc())
+            raise ProducerProcessError(f"{type(e)}: {e}") from e
+
+        finally:
+            self.__emit_outputs(wait=True)
+
+    @METRICS.timed("producer.http_extract")
+    @retry(logger=LOGGER, policy=HTTP_POLICY)
+    def __http_producer(self):
+        try:
+            records = self.http_search.search(
+                self.query.replace("-", " "),
+                start=self.curr_idx,
+                first_page=self.first_page,
+                last_page=self.last_page
+            )
+            for record in records:
+                self.curr_idx = record["index"] + 1
+                obj = self.__get_article_from_record(record)
+                if self.should_stop:
+                    break
+                if obj is None:
+                    continue
+                self.__emit_outputs()
+
+        except Exception as e:
+            self.LOGGER.error(traceback.format_exc())
+            raise ProducerProcessError(f"{type(e)}: {e}") from e
+
+        finally:
+            self.__emit_outputs(wait=True)
+
+    def __produce_by_element(self):
+        while not self.should_stop:
+            self.LOGGER.info(
+                f"Processing article {self.curr_idx}", extra=SAMPLED
+            )
+            article = self.__article_locator()
+            self.curr_idx += 1
+            if not self.driver.does_page_contain_element(article):
+                self.LOGGER.info(f"Article {self.curr_idx} not found.")
+                next = self.__next_page()
+                if not next:
+                    break
+                self.__wait_for("article.shown", article, self.wait_time)
+            obj = self.__get_article_info(article)
+            self.__prune_articles(1)
+            if obj is None:
+                continue
+            self.__emit_outputs()
+
+    def __produce_batch(self):
+        while not self.should_stop:
+            records = self.__get_articles_batch()
+            if not records:
+                self.LOGGER.info(f"Article {self.curr_idx} not found.")
+                next = self.__next_page()
+                if not next:
+                    break
+                continue
+            self.LOGGER.info(
+                f"Processing articles {self.curr_idx} "
+                f"to {self.curr_idx + len(records) - 1}"
+            )
+            processed = 0
+            for record in records:
+                self.curr_idx += 1
+                processed += 1
+                obj = self.__get_article_from_record(record)
+                if self.should_stop:
+                    break
+                if obj is None:
+                    continue
+                self.__emit_outputs()
+            self.__prune_articles(processed)
+
+    @METRICS.timed("article.batch")
+    def __get_articles_batch(self):
+        if self.dom_pruning != "off":
+            locator, start = Elements.PENDING_ARTICLE.value, 1
+        else:
+            locator, start = Elements.ARTICLE.value, self.curr_idx
+        return self.driver.driver.execute_script(
+            EXTRACT_ARTICLES_JS,
+            locator,
+            start
+        ) or []
+
+    def __article_locator(self):
+        if self.dom_pruning != "off":
+            return f"({Elements.PENDING_ARTICLE.value})[1]"
+        return f"{Elements.ARTICLE.value}[{self.curr_idx}]"
+
+    def __prune_articles(self, count):
+        if self.dom_pruning == "off" or count < 1:
+            return 0
+        return self.driver.driver.execute_script(
+            PRUNE_ARTICLES_JS,
+            Elements.PENDING_ARTICLE.value,
+            count,
+            self.dom_pruning
+        )
+
+    def __get_article_from_record(self, record):
+        link = record["link"]
+        if link is None:
+            self.LOGGER.info(
+                f"Article {record['index']} has no link, skipping."
+            )
+            return None
+        if self.__is_indexed(link):
+            return None
+        self.LOGGER.info(f"Started processing article {link}", extra=SAMPLED)
+        article_date = self.__check_article_date(link, record["date"])
+        if article_date is None:
+            return None
+        return self.__build_article(
+            link=link,
+            title=record["title"],
+            article_date=article_date,
+            summary=record["summary"],
+            img=record["img"],
+            alt=record["alt"]
+        )
+
+    @METRICS.timed("article.info")
+    def __get_article_info(self, article):
+        with METRICS.timer("article.scroll"):
+            self.driver.scroll_element_into_view(article)
+        with METRICS.timer("article.link"):
+            link = self.driver.get_element_attribute(
+                f"{article}//h3//a", "href"
+            )
+        if self.__is_indexed(link):
+            return None
+        self.LOGGER.info(f"Started processing article {link}", extra=SAMPLED)
+        with METRICS.timer("article.title"):
+            title = self.driver.get_element_attribute(
+                f"{article}//h3//a", "innerText"
+            )
+        try:
+            with METRICS.timer("article.date"):
+                date_string = self.driver.get_element_attribute(
+                    f"{article}//footer//span[@aria-hidden]",
+                    "innerText"
+                )
+        except selenium.ElementNotFound:
+            date_string = None
+        article_date = self.__check_article_date(link, date_string)
+        if article_date is None:
+            return None
+        with METRICS.timer("article.summary"):
+            summary = self.driver.get_element_attribute(
+                f"{article}//p",
+                "innerText"
+            )
+        with METRICS.timer("article.img"):
+            img = self.driver.get_element_attribute(f"{article}//img", "src")
+        with METRICS.timer("article.alt"):
+            alt = self.driver.get_element_attribute(f"{article}//img", "alt")
+        return self.__build_article(
+            link=link,
+            title=title,
+            article_date=article_date,
+            summary=summary,
+            img=img,
+            alt=alt
+        )
+
+    def __check_article_date(self, link, date_string):
+        if date_string is None:
+            self.LOGGER.info(f"Article {link} is not news.", extra=SAMPLED)
+            return None
+        try:
+            article_date = parse_date(date_string)
+        except ValueError as e:
+            self.LOGGER.info(
+                f"Unable to define date for article {link}: {e}", extra=SAMPLED
+            )
+            return None
+        if article_date < self.limit_date:
+            self.LOGGER.info(
+                f"Article {link} is out of date range.", extra=SAMPLED
+            )
+            self.stop()
+            return None
+        if self.until_date is not None and article_date > self.until_date:
+            self.LOGGER.info(
+                f"Article {link} is newer than this shard.", extra=SAMPLED
+            )
+            return None
+        if self.__is_emitted(link):
+            return None
+        return article_date
+
+    @METRICS.timed("article.build")
+    def __build_article(self, link, title, article_date, summary, img, alt):
+        pub_date = article_date.strftime("%Y-%m-%d")
+        slug_str = slug_from_url(link)
+        obj = {
+            "title": title,
+            "url": link,
+            "description": summary,
+            "img-alt": alt,
+            "image": img,
+            "date": pub_date,
+            "slug": slug_str,
+            "file": ""
+        }
+        if self.search_backend == "snapshot":
+            obj["replay"] = self.http_search.run
+        with METRICS.timer("article.analytics"):
+            self.analytics.analyze(obj, self.query)
+        try:
+            article = Article.from_payload(obj)
+        except ArticleError as e:
+            self.LOGGER.error(f"Skipping invalid article {link}: {e}")
+            return None
+        self.pending.append(
+            (article, self.__download_img(img, slug_str), self.curr_idx)
+        )
+        self.LOGGER.info(
+            f"All information obtained for article {link}", extra=SAMPLED
+        )
+        return article
+
+    def handle_exception(self, e):
+        self.LOGGER.error(e)
+        self.error = self.error_counter()
+        if (
+            self.error < self.RETRY_MAX
+            and not self.BREAKER.is_open
+            and not caused_by(e, PipelineAborted)
+        ):
+            time.sleep(self.RETRY_POLICY.delay(self.error, e))
+            return True
+        self.finish_job_with_exception(e)
+        return False
+
+    def finish_job_with_exception(self, e):
+        self.exception = e
+        if self.chrome_opened:
+            self.session.close()
+            self.chrome_opened = False
+        self.__stop_downloader()
+        self.__stop_http_search()
+        self.__close_index()
+        self.__write_metrics()
+        self.__save_timeouts()
+
+        self.LOGGER.error(
+            f"After {self.error} attempts, "
+            f"the job was finished with exception: {e}"
+        )
+
+    def __reach_to_current_article(self):
+        self.LOGGER.info(f"Searching for article index {self.curr_idx}")
+        self.__wait_for(
+            "reach.results",
+            Elements.RESULTS.value,
+            Timeouts.SECOND_30.value
+        )
+        while self.pages < self.resume_pages:
+            if not self.__next_page():
+                break
+        while not self.driver.does_page_contain_element(
+            f"{Elements.ARTICLE.value}[{self.curr_idx}]"
+        ):
+            next = self.__next_page()
+            if not next:
+                break
+        self.__prune_articles(self.curr_idx - 1)
+        self.LOGGER.info(f"Reached page containing article {self.curr_idx}")
@@ -0,0 +1,69 @@
+import threading
+
+from utils.article_index import ArticleIndex
+
+
+def record(number):
+    slug = f"story-{number}"
+    return {
+        "slug": slug,
+        "url": f"https://example.com/news/{slug}",
+        "date": "2024-01-01",
+    }
+
+
+def test_mark_written_once(tmp_path):
+    index = ArticleIndex(tmp_path / "articles.sqlite")
+    assert index.mark_written(record(1))
+    assert not index.mark_written(record(1))
+    assert index.written("story-1")
+    index.close()
+
+
+def test_put_keeps_written_at(tmp_path):
+    index = ArticleIndex(tmp_path / "articles.sqlite")
+    index.mark_written(record(1))
+    index.put(record(1))
+    assert index.written("story-1")
+    index.close()
+
+
+def test_concurrent_put_and_mark_written(tmp_path):
+    path = tmp_path / "articles.sqlite"
+    producer = ArticleIndex(path)
+    consumer = ArticleIndex(path)
+    records = [record(number) for number in range(500)]
+    errors = []
+    marked = []
+
+    def run(func, results=None):
+        try:
+            for item in records:
+                result = func(item)
+                if results is not None:
+                    results.append(result)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run, args=(producer.put,)),
+        threading.Thread(target=run, args=(consumer.mark_written, marked)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert all(marked)
+    assert all(consumer.written(item["slug"]) for item in records)
+    producer.close()
+    consumer.close()
+
+
+def test_mark_all_written(tmp_path):
+    index = ArticleIndex(tmp_path / "articles.sqlite")
+    index.mark_written(record(1))
+    assert index.mark_all_written([record(1), record(2), record(3)]) == 2
+    assert all(index.written(f"story-{number}") for number in (1, 2, 3))
+    index.close()
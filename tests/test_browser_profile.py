@@ -0,0 +1,28 @@
+import re
+
+from utils import build_profile
+
+
+def blocked(patterns, url):
+    return any(
+        re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url)
+        for pattern in patterns
+    )
+
+
+def test_lean_profile_blocks_resources_by_extension():
+    patterns = build_profile("lean", "image,media", "doubleclick.net")[
+        "blocked_urls"
+    ]
+    assert blocked(patterns, "https://example.com/imgs/1.jpg")
+    assert blocked(patterns, "https://example.com/imgs/1.jpg?w=640")
+    assert blocked(patterns, "https://example.com/live/segment-3.ts")
+    assert blocked(patterns, "https://ad.doubleclick.net/pixel")
+    assert not blocked(patterns, "https://example.com/search/stock?page=2")
+    assert not blocked(patterns, "https://example.com/news/stats-today")
+    assert not blocked(patterns, "https://example.com/app.tsx.js")
+    assert not blocked(patterns, "https://example.com/?ref=doubleclick.net")
+
+
+def test_default_profile_blocks_nothing():
+    assert build_profile("default", "image")["blocked_urls"] == []
@@ -0,0 +1,158 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from utils import (
+    HttpSearchBackend,
+    HttpSearchError,
+    is_retryable,
+    parse_articles,
+    RetryPolicy,
+    retry
+)
+
+TEMPLATE = "{url}/search/{query}?sort=date&page={page}"
+
+
+def article(number):
+    return f"""
+    <article class="gc">
+      <h3><a href="/news/story-{number}"><span>Story {number}</span></a></h3>
+      <p>Summary of story {number}.</p>
+      <footer><span aria-hidden="true">{number + 1} Jan 2024</span></footer>
+      <img src="/imgs/{number}.jpg" alt="Picture {number}">
+    </article>
+    """
+
+
+class StubSite():
+    def __init__(self, pages):
+        self.pages = pages
+        self.responses = []
+        self.requests = []
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site.requests.append(self.path)
+                if site.responses:
+                    status, headers = site.responses.pop(0)
+                    self.send_response(status)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    return
+                query = parse_qs(urlparse(self.path).query)
+                page = int(query["page"][0])
+                body = "".join(
+                    article(number) for number in site.pages.get(page, [])
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(
+            target=self.server.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True
+        )
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def site():
+    site = StubSite({1: [0, 1, 2], 2: [2, 3, 4], 3: []}).start()
+    yield site
+    site.stop()
+
+
+def backend(site):
+    return HttpSearchBackend(TEMPLATE, site.url, timeout=5.0)
+
+
+def test_parse_articles():
+    records = parse_articles(article(7), "https://example.com/search")
+    assert records == [{
+        "link": "https://example.com/news/story-7",
+        "title": "Story 7",
+        "date": "8 Jan 2024",
+        "summary": "Summary of story 7.",
+        "img": "https://example.com/imgs/7.jpg",
+        "alt": "Picture 7",
+    }]
+
+
+def test_search_pages_until_no_new_articles(site):
+    records = list(backend(site).search("stock market"))
+    assert [record["link"] for record in records] == [
+        f"{site.url}/news/story-{number}" for number in range(5)
+    ]
+    assert [record["index"] for record in records] == [1, 2, 3, 4, 5]
+    assert site.requests[0] == "/search/stock%20market?sort=date&page=1"
+    assert len(site.requests) == 3
+
+
+def test_search_resumes_from_start(site):
+    records = list(backend(site).search("stock market", start=4))
+    assert [record["index"] for record in records] == [4, 5]
+
+
+def test_empty_first_page_raises(site):
+    site.pages.clear()
+    with pytest.raises(HttpSearchError):
+        list(backend(site).search("stock market"))
+
+
+def test_rate_limit_carries_retry_after(site):
+    site.responses.append((429, {"Retry-After": "20"}))
+    with pytest.raises(HttpSearchError) as error:
+        backend(site).fetch_page("stock market", 1)
+    assert error.value.status_code == 429
+    assert error.value.retry_after == 20.0
+    assert is_retryable(error.value)
+    policy = RetryPolicy(max_delay=30.0, jitter=0.0, classify=is_retryable)
+    assert policy.delay(0, error.value) == 20.0
+
+
+def test_rate_limit_is_retried(site):
+    site.responses.append((429, {"Retry-After": "1"}))
+    search = backend(site)
+    policy = RetryPolicy(
+        attempts=2, base_delay=0.0, max_delay=0.01, classify=is_retryable
+    )
+    fetch = retry(policy=policy)(search.fetch_page)
+    assert len(fetch("stock market", 1)) == 3
+    assert len(site.requests) == 2
+
+
+def test_not_found_is_not_retried(site):
+    site.responses.append((404, {}))
+    search = backend(site)
+    policy = RetryPolicy(attempts=3, base_delay=0.0, classify=is_retryable)
+    with pytest.raises(HttpSearchError):
+        retry(policy=policy)(search.fetch_page)("stock market", 1)
+    assert len(site.requests) == 1
+
+
+def test_search_page_range(site):
+    records = list(backend(site).search(
+        "stock market", first_page=2, last_page=2
+    ))
+    assert [record["index"] for record in records] == [1, 2, 3]
+    assert site.requests == ["/search/stock%20market?sort=date&page=2"]
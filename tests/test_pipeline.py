@@ -0,0 +1,44 @@
+import json
+
+import pytest
+from mock_site import MockNewsSite
+
+pytest.importorskip("RPA.Browser.Selenium")
+
+QUERIES = ("stock market", "oil prices", "tech shares", "central bank")
+
+
+@pytest.fixture
+def site():
+    site = MockNewsSite(
+        articles=400,
+        page_size=20,
+        loading_delay=0,
+        span_days=200
+    ).start()
+    yield site
+    site.stop()
+
+
+def test_pipeline_with_default_config(site, tmp_path, monkeypatch):
+    from news.pipeline import Pipeline
+
+    items = tmp_path / "input.json"
+    items.write_text(json.dumps([
+        {"payload": {"query": query, "topic": "test", "months": 6}}
+        for query in QUERIES
+    ]))
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("URL", site.url)
+    monkeypatch.setenv("SEARCH_BACKEND", "http")
+    monkeypatch.setenv("RC_WORKITEM_INPUT_PATH", str(items))
+    monkeypatch.setenv("RC_WORKITEM_OUTPUT_PATH", str(tmp_path / "out.json"))
+
+    pipeline = Pipeline()
+    pipeline.run()
+
+    assert pipeline.records.error is None
+    assert pipeline.done == len(QUERIES)
+    assert pipeline.failed == 0
+    assert tmp_path.joinpath("data", "articles.sqlite").is_file()
+    assert list(tmp_path.joinpath("output").glob("*.xlsx"))
@@ -0,0 +1,48 @@
+from datetime import date
+
+from utils.planner import find_last_page, page_ranges, plan_shards
+
+PAYLOAD = {"query": "stock market", "topic": "business", "months": 3}
+
+
+def test_find_last_page():
+    probed = []
+
+    def in_range(page):
+        probed.append(page)
+        return page <= 37
+
+    assert find_last_page(in_range) == 37
+    assert len(probed) < 15
+
+
+def test_find_last_page_without_results():
+    assert find_last_page(lambda page: False) == 0
+    assert find_last_page(lambda page: True, max_page=50) == 50
+
+
+def test_page_ranges_overlap_by_one_page():
+    assert page_ranges(10, 4) == [(1, 4), (4, 7), (7, 9), (9, None)]
+    assert page_ranges(2, 4) == [(1, 2), (2, None)]
+    assert page_ranges(0, 4) == [(1, None)]
+
+
+def test_plan_shards_by_pages():
+    shards = plan_shards(
+        PAYLOAD,
+        window_months=1,
+        today=date(2024, 3, 15),
+        pages={"stock market": page_ranges(10, 2)}
+    )
+    assert [
+        (shard["first_page"], shard["last_page"], shard["shard"])
+        for shard in shards
+    ] == [(1, 6, "1/2"), (6, None, "2/2")]
+    assert {shard["since"] for shard in shards} == {"2024-01-01"}
+    assert {shard["until"] for shard in shards} == {"2024-03-15"}
+
+
+def test_plan_shards_without_pages():
+    shards = plan_shards(PAYLOAD, window_months=0, today=date(2024, 3, 15))
+    assert len(shards) == 1
+    assert "first_page" not in shards[0]
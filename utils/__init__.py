@@ -1,2 +1,79 @@
-from .retry import retry
-from .new_counter import new_counter
+import importlib
+
+EXPORTS = {
+    "retry": ".retry",
+    "RetryPolicy": ".retry",
+    "CircuitBreaker": ".retry",
+    "CircuitOpenError": ".retry",
+    "RetryBudgetExceeded": ".retry",
+    "caused_by": ".retry",
+    "new_counter": ".new_counter",
+    "ImageDownloader": ".image_downloader",
+    "EXTRACT_ARTICLES_JS": ".scripts",
+    "PRUNE_ARTICLES_JS": ".scripts",
+    "HttpSearchBackend": ".http_search",
+    "HttpSearchError": ".http_search",
+    "parse_articles": ".http_search",
+    "is_retryable": ".http_search",
+    "SessionOutputs": ".session",
+    "read_input_payloads": ".session",
+    "OutputBatcher": ".output_batcher",
+    "batch_records": ".output_batcher",
+    "is_batch": ".output_batcher",
+    "StreamingExcelWriter": ".excel_writer",
+    "recover_journals": ".excel_writer",
+    "ArticleIndex": ".article_index",
+    "slug_from_url": ".article_index",
+    "ImageCache": ".image_cache",
+    "Checkpoint": ".checkpoint",
+    "BrowserSession": ".browser_session",
+    "build_profile": ".browser_profile",
+    "METRICS": ".metrics",
+    "Metrics": ".metrics",
+    "RecordQueue": ".pipeline",
+    "PipelineAborted": ".pipeline",
+    "SinkSet": ".sinks",
+    "SINKS": ".sinks",
+    "COLUMNS": ".sinks",
+    "EXCEL_COLUMNS": ".sinks",
+    "row_from_payload": ".sinks",
+    "split_sinks": ".sinks",
+    "configure_logging": ".logs",
+    "SAMPLED": ".logs",
+    "LOGS": ".logs",
+    "lazy_import": ".lazy",
+    "plan_shards": ".planner",
+    "month_windows": ".planner",
+    "find_last_page": ".planner",
+    "page_ranges": ".planner",
+    "shard_queries": ".planner",
+    "MergeSpool": ".merge",
+    "merge_records": ".merge",
+    "AdaptiveTimeouts": ".adaptive_timeouts",
+    "SnapshotArchive": ".snapshots",
+    "SnapshotSearchBackend": ".snapshots",
+    "SnapshotError": ".snapshots",
+    "TextAnalytics": ".analytics",
+    "parse_date": ".analytics",
+    "phrase_count": ".analytics",
+    "PROFILER": ".profiling",
+    "Article": ".article",
+    "ArticleError": ".article",
+    "encode_records": ".article",
+    "decode_records": ".article",
+    "load_msgpack": ".article",
+    "ENCODINGS": ".article",
+}
+
+__all__ = list(EXPORTS)
+
+
+def __getattr__(name):
+    module = EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    imported = importlib.import_module(module, __name__)
+    for export, source in EXPORTS.items():
+        if source == module:
+            globals()[export] = getattr(imported, export)
+    return globals()[name]
@@ -0,0 +1,145 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger("AdaptiveTimeouts")
+
+
+class LatencyStats():
+    def __init__(self, alpha=0.2, max_samples=200):
+        self.alpha = alpha
+        self.ewma = None
+        self.count = 0
+        self.samples = deque(maxlen=max_samples)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.samples.append(seconds)
+        if self.ewma is None:
+            self.ewma = seconds
+        else:
+            self.ewma += self.alpha * (seconds - self.ewma)
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+    def to_dict(self):
+        return {
+            "ewma": self.ewma,
+            "count": self.count,
+            "samples": list(self.samples),
+        }
+
+    @classmethod
+    def from_dict(cls, data, alpha=0.2, max_samples=200):
+        stats = cls(alpha=alpha, max_samples=max_samples)
+        stats.ewma = data.get("ewma")
+        stats.count = data.get("count", 0)
+        stats.samples.extend(data.get("samples", []))
+        return stats
+
+
+class AdaptiveTimeouts():
+    def __init__(
+        self,
+        path=None,
+        margin=2.0,
+        percentile=95,
+        floor=0.5,
+        min_samples=5,
+        alpha=0.2,
+        max_samples=200,
+        enabled=True,
+        logger=logger
+    ):
+        self.path = Path(path) if path else None
+        self.margin = margin
+        self.percentile = percentile
+        self.floor = floor
+        self.min_samples = min_samples
+        self.alpha = alpha
+        self.max_samples = max_samples
+        self.enabled = enabled
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.load()
+
+    def timeout(self, key, default):
+        if not self.enabled:
+            return default
+        with self.lock:
+            stats = self.stats.get(key)
+            if stats is None or stats.count < self.min_samples:
+                return default
+            observed = max(stats.percentile(self.percentile), stats.ewma)
+        return min(max(observed * self.margin, self.floor), default)
+
+    def observe(self, key, seconds):
+        with self.lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = LatencyStats(self.alpha, self.max_samples)
+                self.stats[key] = stats
+            stats.observe(seconds)
+
+    @contextmanager
+    def measure(self, key, timeout):
+        start = time.perf_counter()
+        try:
+            yield timeout
+        except Exception:
+            self.observe(key, timeout * self.margin)
+            raise
+        self.observe(key, time.perf_counter() - start)
+
+    def summary(self):
+        with self.lock:
+            return {
+                key: {
+                    "ewma": stats.ewma,
+                    "p50": stats.percentile(50),
+                    f"p{self.percentile}": stats.percentile(self.percentile),
+                    "count": stats.count,
+                }
+                for key, stats in sorted(self.stats.items())
+            }
+
+    def load(self):
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable {self.path}: {e}")
+            return
+        with self.lock:
+            self.stats = {
+                key: LatencyStats.from_dict(
+                    value, self.alpha, self.max_samples
+                )
+                for key, value in data.items()
+            }
+        self.logger.info(
+            f"Loaded learned timeouts for {len(self.stats)} waits."
+        )
+
+    def save(self):
+        if self.path is None:
+            return
+        with self.lock:
+            data = {
+                key: stats.to_dict() for key, stats in self.stats.items()
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(f"{self.path.name}.part")
+        partial.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(partial, self.path)
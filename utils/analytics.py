@@ -0,0 +1,116 @@
+import os
+import re
+from datetime import date
+
+DATE_PATTERN = re.compile(r"([0-9]{1,2}) (\w{3}) ([0-9]{4})")
+CURRENCY_WORDS = re.compile(r"\s(?:dollars|USD)")
+MONTHS = {
+    name: number for number, name in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun",
+         "jul", "aug", "sep", "oct", "nov", "dec"),
+        start=1
+    )
+}
+MAX_TEXT = 4096
+
+
+def parse_terms(value):
+    if not value:
+        return ()
+    return tuple(term.strip() for term in value.split(",") if term.strip())
+
+
+def literal_pattern(terms, ignore_case=False):
+    if not terms:
+        return None
+    alternatives = []
+    for term in sorted(set(terms), key=len, reverse=True):
+        escaped = re.escape(term)
+        if term[0].isalnum():
+            escaped = rf"\b{escaped}"
+        if term[-1].isalnum():
+            escaped = rf"{escaped}\b"
+        alternatives.append(escaped)
+    flags = re.IGNORECASE if ignore_case else 0
+    return re.compile("|".join(alternatives), flags)
+
+
+def parse_date(text):
+    match = DATE_PATTERN.search(text or "")
+    if match is None:
+        raise ValueError(f"Date string format is incorrect: {text}")
+    day, month, year = match.groups()
+    number = MONTHS.get(month.lower())
+    if number is None:
+        raise ValueError(f"Date string format is incorrect: {text}")
+    return date(int(year), number, int(day))
+
+
+def phrase_count(text, phrase):
+    if not text or not phrase:
+        return 0
+    return str(text).count(phrase)
+
+
+class TextAnalytics():
+    def __init__(self, currency_terms=(), phrases=(), max_text=MAX_TEXT):
+        self.max_text = max_text
+        self.currency_terms = tuple(currency_terms)
+        self.phrases = tuple(phrases)
+        self.currency_pattern = literal_pattern(self.currency_terms)
+        self.phrase_patterns = {
+            phrase: literal_pattern([phrase], ignore_case=True)
+            for phrase in self.phrases
+        }
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            currency_terms=parse_terms(os.getenv("ANALYTICS_CURRENCY_TERMS")),
+            phrases=parse_terms(os.getenv("ANALYTICS_PHRASES")),
+            max_text=int(os.getenv("ANALYTICS_MAX_TEXT", MAX_TEXT))
+        )
+
+    def clip(self, text):
+        if not text:
+            return ""
+        return text if len(text) <= self.max_text else text[:self.max_text]
+
+    def is_currency_related(self, *texts):
+        for text in texts:
+            if not text:
+                continue
+            if "$" in text:
+                return True
+            if ("dollars" in text or "USD" in text) and (
+                CURRENCY_WORDS.search(text)
+            ):
+                return True
+            if self.currency_pattern is not None and (
+                self.currency_pattern.search(self.clip(text))
+            ):
+                return True
+        return False
+
+    def phrase_counts(self, *texts):
+        text = " ".join(self.clip(text) for text in texts)
+        return {
+            phrase: len(pattern.findall(text))
+            for phrase, pattern in self.phrase_patterns.items()
+        }
+
+    def analyze(self, record, query):
+        record["count"] = phrase_count(record.get("url"), query)
+        record["matches-currency"] = self.is_currency_related(
+            record.get("description"),
+            record.get("title")
+        )
+        if self.phrase_patterns:
+            record["phrases"] = self.phrase_counts(
+                record.get("title"),
+                record.get("description")
+            )
+        return record
+
+    def analyze_batch(self, records, query):
+        return [self.analyze(record, query) for record in records]
@@ -0,0 +1,141 @@
+import base64
+import re
+from dataclasses import dataclass, fields
+
+DATE_FORMAT = re.compile(r"\d{4}-\d{2}-\d{2}")
+ENCODINGS = ("json", "rows", "msgpack")
+REQUIRED = ("url", "date", "slug")
+OPTIONAL = ("title", "description", "img_alt", "image", "file", "replay")
+
+
+class ArticleError(ValueError):
+    pass
+
+
+@dataclass(slots=True)
+class Article():
+    title: str
+    url: str
+    description: str
+    img_alt: str
+    image: str
+    date: str
+    count: int
+    matches_currency: bool
+    slug: str
+    file: str = ""
+    phrases: dict = None
+    replay: str = ""
+
+    def __post_init__(self):
+        for name in REQUIRED:
+            value = getattr(self, name)
+            if not isinstance(value, str) or not value:
+                raise ArticleError(f"Article {name} must be a non-empty str.")
+        for name in OPTIONAL:
+            value = getattr(self, name)
+            if value is None:
+                setattr(self, name, "")
+            elif not isinstance(value, str):
+                raise ArticleError(f"Article {name} must be a str.")
+        if not DATE_FORMAT.fullmatch(self.date):
+            raise ArticleError(f"Article date {self.date!r} is not ISO.")
+        if isinstance(self.count, bool) or not isinstance(self.count, int):
+            raise ArticleError("Article count must be an int.")
+        if not isinstance(self.matches_currency, bool):
+            raise ArticleError("Article matches_currency must be a bool.")
+        if self.phrases is not None and not isinstance(self.phrases, dict):
+            raise ArticleError("Article phrases must be a dict.")
+
+    @classmethod
+    def from_payload(cls, payload):
+        values = {}
+        for name, key in KEYS.items():
+            if key in payload:
+                values[name] = payload[key]
+            elif name not in DEFAULTS:
+                raise ArticleError(f"Article payload is missing {key!r}.")
+        return cls(**values)
+
+    def to_payload(self):
+        payload = {key: getattr(self, name) for name, key in KEYS.items()}
+        if self.phrases is None:
+            del payload["phrases"]
+        if not self.replay:
+            del payload["replay"]
+        return payload
+
+    def to_row(self):
+        return [getattr(self, name) for name in FIELDS]
+
+
+FIELDS = tuple(field.name for field in fields(Article))
+DEFAULTS = ("file", "phrases", "replay")
+KEYS = {name: name.replace("_", "-") for name in FIELDS}
+PAYLOAD_KEYS = tuple(KEYS.values())
+
+
+def load_msgpack():
+    try:
+        import msgpack
+    except ImportError as e:
+        raise ImportError(
+            "The msgpack payload encoding requires msgpack to be installed."
+        ) from e
+    return msgpack
+
+
+def payload_row(payload):
+    if isinstance(payload, Article):
+        return payload.to_row()
+    return [payload.get(key) for key in PAYLOAD_KEYS]
+
+
+def row_payload(row, keys=PAYLOAD_KEYS):
+    payload = dict(zip(keys, row))
+    if payload.get("phrases") is None:
+        payload.pop("phrases", None)
+    if not payload.get("replay"):
+        payload.pop("replay", None)
+    return payload
+
+
+def pack_rows(payloads):
+    return load_msgpack().packb(
+        [payload_row(payload) for payload in payloads],
+        use_bin_type=True
+    )
+
+
+def unpack_rows(data):
+    return load_msgpack().unpackb(data, raw=False)
+
+
+def encode_records(payloads, encoding="json"):
+    if encoding == "json":
+        return {"records": list(payloads)}
+    if encoding == "rows":
+        records = [payload_row(payload) for payload in payloads]
+    elif encoding == "msgpack":
+        records = base64.b64encode(pack_rows(payloads)).decode("ascii")
+    else:
+        raise ValueError(f"Unknown payload encoding {encoding!r}.")
+    return {
+        "encoding": encoding,
+        "fields": list(PAYLOAD_KEYS),
+        "records": records,
+    }
+
+
+def decode_records(payload):
+    encoding = payload.get("encoding", "json")
+    if encoding == "json":
+        return payload["records"]
+    if encoding == "rows":
+        rows = payload["records"]
+    elif encoding == "msgpack":
+        rows = unpack_rows(base64.b64decode(payload["records"]))
+    else:
+        raise ValueError(f"Unknown payload encoding {encoding!r}.")
+    keys = tuple(payload.get("fields") or PAYLOAD_KEYS)
+    return [row_payload(row, keys) for row in rows]
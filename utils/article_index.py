@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger("ArticleIndex")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    slug TEXT PRIMARY KEY,
+    url TEXT,
+    date TEXT,
+    record TEXT,
+    image_path TEXT,
+    content_hash TEXT,
+    first_seen REAL,
+    last_seen REAL,
+    written_at REAL
+);
+CREATE INDEX IF NOT EXISTS articles_last_seen ON articles (last_seen);
+"""
+
+
+def slug_from_url(url):
+    return str(url).rstrip("/").split("/")[-1]
+
+
+def file_hash(path):
+    if not path or not Path(path).is_file():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArticleIndex():
+    def __init__(
+        self,
+        path,
+        max_age_days=90,
+        max_entries=100000,
+        logger=logger
+    ):
+        self.path = Path(path)
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            self.path,
+            timeout=30.0,
+            check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def get(self, slug):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT record FROM articles WHERE slug = ?",
+                (slug,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def seen(self, slug):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT date FROM articles WHERE slug = ?",
+                (slug,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE articles SET last_seen = ? WHERE slug = ?",
+                (time.time(), slug)
+            )
+            self.conn.commit()
+        return row[0]
+
+    def put(self, record):
+        now = time.time()
+        image_path = record.get("file") or None
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT INTO articles (
+                    slug, url, date, record, image_path, content_hash,
+                    first_seen, last_seen
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(slug) DO UPDATE SET
+                    url = excluded.url,
+                    date = excluded.date,
+                    record = excluded.record,
+                    image_path = excluded.image_path,
+                    content_hash = excluded.content_hash,
+                    last_seen = excluded.last_seen
+                """,
+                (
+                    record["slug"],
+                    record.get("url"),
+                    record.get("date"),
+                    json.dumps(record),
+                    image_path,
+                    file_hash(image_path),
+                    now,
+                    now
+                )
+            )
+            self.conn.commit()
+
+    def written(self, slug):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT written_at FROM articles WHERE slug = ?",
+                (slug,)
+            ).fetchone()
+        return row is not None and row[0] is not None
+
+    def mark_written(self, record):
+        return self.mark_all_written([record]) == 1
+
+    def mark_all_written(self, records):
+        now = time.time()
+        marked = 0
+        with self.lock:
+            for record in records:
+                marked += self.__mark_written(record, now)
+            self.conn.commit()
+        return marked
+
+    def __mark_written(self, record, now):
+        row = self.conn.execute(
+            """
+            INSERT INTO articles (
+                slug, url, date, record, image_path,
+                first_seen, last_seen, written_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(slug) DO UPDATE SET
+                written_at = COALESCE(
+                    articles.written_at, excluded.written_at
+                )
+            RETURNING written_at
+            """,
+            (
+                record["slug"],
+                record.get("url"),
+                record.get("date"),
+                json.dumps(record),
+                record.get("file") or None,
+                now,
+                now,
+                now
+            )
+        ).fetchone()
+        return row[0] == now
+
+    def compact(self):
+        cutoff = time.time() - self.max_age_days * 24 * 60 * 60
+        with self.lock:
+            expired = self.conn.execute(
+                "DELETE FROM articles WHERE last_seen < ?",
+                (cutoff,)
+            ).rowcount
+            overflow = self.conn.execute(
+                """
+                DELETE FROM articles WHERE slug IN (
+                    SELECT slug FROM articles
+                    ORDER BY last_seen DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            ).rowcount
+            self.conn.commit()
+            if expired or overflow:
+                self.conn.execute("VACUUM")
+        self.logger.info(
+            f"Article index compacted: {expired} expired, "
+            f"{overflow} over capacity."
+        )
+        return expired + overflow
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
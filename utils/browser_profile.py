@@ -0,0 +1,57 @@
+RESOURCE_EXTENSIONS = {
+    "image": ["jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "m3u8", "mp3", "ts"],
+    "stylesheet": ["css"],
+}
+
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-renderer-backgrounding",
+    "--mute-audio",
+    "--window-size=1920,1080",
+    "--blink-settings=imagesEnabled=false",
+]
+
+LEAN_PREFERENCES = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+}
+
+
+def split_list(value):
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def blocked_url_patterns(resources, domains):
+    patterns = []
+    for resource in resources:
+        for extension in RESOURCE_EXTENSIONS.get(resource, []):
+            patterns.extend([f"*.{extension}", f"*.{extension}?*"])
+    for domain in domains:
+        patterns.extend([f"*://{domain}/*", f"*.{domain}/*"])
+    return patterns
+
+
+def build_profile(name, resources=None, domains=None):
+    if name != "lean":
+        return {
+            "headless": False,
+            "arguments": [],
+            "preferences": {},
+            "blocked_urls": [],
+        }
+    return {
+        "headless": True,
+        "arguments": list(LEAN_ARGUMENTS),
+        "preferences": dict(LEAN_PREFERENCES),
+        "blocked_urls": blocked_url_patterns(
+            split_list(resources),
+            split_list(domains)
+        ),
+    }
@@ -0,0 +1,120 @@
+import atexit
+import logging
+import multiprocessing.util
+import threading
+import time
+
+logger = logging.getLogger("BrowserSession")
+
+DOCUMENT_READY = "return document.readyState !== 'loading'"
+
+
+class BrowserSession():
+    SESSIONS = []
+    LOCAL = threading.local()
+
+    def __init__(self, logger=logger):
+        self.selenium = None
+        self.opened = False
+        self.startup_time = None
+        self.logger = logger
+        BrowserSession.SESSIONS.append(self)
+
+    @classmethod
+    def current(cls, logger=logger):
+        session = getattr(cls.LOCAL, "session", None)
+        if session is None:
+            session = cls(logger=logger)
+            cls.LOCAL.session = session
+        return session
+
+    @property
+    def driver(self):
+        if self.selenium is None:
+            from RPA.Browser.Selenium import Selenium
+            self.selenium = Selenium()
+        return self.selenium
+
+    @classmethod
+    def close_all(cls):
+        for session in cls.SESSIONS:
+            session.close()
+
+    @classmethod
+    def close_at_exit(cls):
+        multiprocessing.util.Finalize(None, cls.close_all, exitpriority=10)
+
+    def is_alive(self):
+        if not self.opened:
+            return False
+        try:
+            self.driver.get_location()
+            return True
+        except Exception:
+            return False
+
+    def ensure_open(
+        self,
+        url,
+        options,
+        ready_locator=None,
+        timeout=30.0,
+        profile=None
+    ):
+        if self.is_alive():
+            self.logger.info("Reusing warm browser session.")
+            self.navigate(url, ready_locator, timeout)
+            return False
+
+        self.close()
+        profile = profile or {}
+        blocked_urls = profile.get("blocked_urls") or []
+        headless = profile.get("headless", False)
+        start = time.perf_counter()
+        self.driver.open_available_browser(
+            url=None if blocked_urls else url,
+            headless=headless,
+            preferences=profile.get("preferences") or None,
+            options=options
+        )
+        self.opened = True
+        if not headless:
+            self.driver.maximize_browser_window()
+        if blocked_urls:
+            self.block_urls(blocked_urls)
+            self.driver.go_to(url)
+        self.wait_until_ready(ready_locator, timeout)
+        self.startup_time = time.perf_counter() - start
+        self.logger.info(
+            f"Browser ready in {self.startup_time:.2f}s."
+        )
+        return True
+
+    def block_urls(self, patterns):
+        self.driver.execute_cdp("Network.enable", {})
+        self.driver.execute_cdp("Network.setBlockedURLs", {"urls": patterns})
+        self.logger.info(f"Blocking {len(patterns)} URL patterns.")
+
+    def navigate(self, url, ready_locator=None, timeout=30.0):
+        if not self.driver.is_location(url):
+            self.driver.go_to(url)
+        self.wait_until_ready(ready_locator, timeout)
+
+    def wait_until_ready(self, ready_locator=None, timeout=30.0):
+        self.driver.wait_for_condition(DOCUMENT_READY, timeout=timeout)
+        if ready_locator is not None:
+            self.driver.wait_until_page_contains_element(
+                locator=ready_locator,
+                timeout=timeout
+            )
+
+    def close(self):
+        if self.opened:
+            try:
+                self.driver.close_browser()
+            except Exception as e:
+                self.logger.warning(f"Error closing browser. {e}")
+        self.opened = False
+
+
+atexit.register(BrowserSession.close_all)
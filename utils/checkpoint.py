@@ -0,0 +1,51 @@
+import json
+import os
+import time
+from pathlib import Path
+
+
+class Checkpoint():
+    def __init__(self, directory, key, run=None, max_age=None):
+        self.path = Path(directory).joinpath(f"{key}.json")
+        self.run = run
+        self.max_age = max_age
+        self.created = None
+
+    def load(self):
+        if not self.path.is_file():
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not self.__matches(state):
+            self.clear()
+            return None
+        self.created = state["created"]
+        return state
+
+    def save(self, **state):
+        if self.created is None:
+            self.created = time.time()
+        state.update(run=self.run, created=self.created)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(f"{self.path.name}.part")
+        with open(partial, "w", encoding="utf-8") as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(partial, self.path)
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+        self.created = None
+
+    def __matches(self, state):
+        if not isinstance(state, dict) or "created" not in state:
+            return False
+        if self.run is not None and state.get("run") != self.run:
+            return False
+        if self.max_age is None:
+            return True
+        return time.time() - state["created"] <= self.max_age
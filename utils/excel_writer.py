@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from .metrics import METRICS
+from .profiling import PROFILER
+
+logger = logging.getLogger("ExcelWriter")
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class StreamingExcelWriter():
+    def __init__(
+        self,
+        path,
+        sheet_name,
+        header,
+        batch_size=500,
+        flush_interval=30.0,
+        logger=logger
+    ):
+        self.path = Path(path)
+        self.journal = self.path.with_name(self.path.name + JOURNAL_SUFFIX)
+        self.sheet_name = sheet_name
+        self.header = list(header)
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = flush_interval
+        self.logger = logger
+        self.workbook = None
+        self.worksheet = None
+        self.buffer = []
+        self.rows = 0
+        self.last_flush = time.monotonic()
+
+    def open(self):
+        from openpyxl import Workbook
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.workbook = Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet(self.sheet_name)
+        self.worksheet.append(self.header)
+        if self.journal.exists():
+            self.__replay_journal()
+        else:
+            self.journal.write_text("", encoding="utf-8")
+        return self
+
+    def append(self, row):
+        self.buffer.append(list(row))
+        if (
+            len(self.buffer) >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return 0
+        with METRICS.timer("excel.flush"), PROFILER.track("excel.flush"):
+            return self.__flush()
+
+    def __flush(self):
+        with open(self.journal, "a", encoding="utf-8") as file:
+            for row in self.buffer:
+                file.write(json.dumps(row, default=str) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        for row in self.buffer:
+            self.worksheet.append(row)
+        flushed = len(self.buffer)
+        self.rows += flushed
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.logger.info(f"Flushed {flushed} rows to {self.path}.")
+        return flushed
+
+    def close(self):
+        if self.workbook is None:
+            return
+        self.flush()
+        with PROFILER.track("excel.save"):
+            self.workbook.save(self.path)
+        self.workbook = None
+        self.worksheet = None
+        self.journal.unlink(missing_ok=True)
+        self.logger.info(f"Saved {self.rows} rows to {self.path}.")
+
+    def __replay_journal(self):
+        with open(self.journal, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    self.worksheet.append(json.loads(line))
+                    self.rows += 1
+        self.logger.info(
+            f"Recovered {self.rows} rows from {self.journal}."
+        )
+
+
+def recover_journals(directory, sheet_name, header, logger=logger):
+    recovered = []
+    for journal in Path(directory).glob(f"*{JOURNAL_SUFFIX}"):
+        path = journal.with_name(journal.name[:-len(JOURNAL_SUFFIX)])
+        writer = StreamingExcelWriter(path, sheet_name, header, logger=logger)
+        writer.open()
+        writer.close()
+        recovered.append(str(path))
+    return recovered
@@ -0,0 +1,187 @@
+import logging
+from html.parser import HTMLParser
+from urllib.parse import quote, urljoin
+
+import requests
+
+logger = logging.getLogger("HttpSearch")
+
+
+class HttpSearchError(Exception):
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def is_retryable(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return None
+    return status == 429 or status >= 500
+
+
+class ArticleParser(HTMLParser):
+    FIELDS = ("link", "title", "date", "summary", "img", "alt")
+
+    def __init__(self, base_url):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.records = []
+        self.record = None
+        self.depth = 0
+        self.h3 = 0
+        self.footer = 0
+        self.capture = None
+        self.buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "article":
+            if self.record is None:
+                self.record = dict.fromkeys(self.FIELDS)
+                self.depth = 0
+            self.depth += 1
+            return
+        if self.record is None:
+            return
+
+        if tag == "h3":
+            self.h3 += 1
+        elif tag == "footer":
+            self.footer += 1
+        elif tag == "a" and self.h3 and self.record["link"] is None:
+            self.record["link"] = self.__absolute(attrs.get("href"))
+            self.__start_capture("title")
+        elif tag == "span" and self.footer and "aria-hidden" in attrs:
+            if self.record["date"] is None:
+                self.__start_capture("date")
+        elif tag == "p" and self.record["summary"] is None:
+            self.__start_capture("summary")
+        elif tag == "img" and self.record["img"] is None:
+            self.record["img"] = self.__absolute(attrs.get("src"))
+            self.record["alt"] = attrs.get("alt") or ""
+
+    def handle_endtag(self, tag):
+        if self.record is None:
+            return
+        if self.capture is not None and tag == self.__capture_tag():
+            self.record[self.capture] = " ".join(
+                "".join(self.buffer).split()
+            )
+            self.capture = None
+            self.buffer = []
+
+        if tag == "h3":
+            self.h3 = max(self.h3 - 1, 0)
+        elif tag == "footer":
+            self.footer = max(self.footer - 1, 0)
+        elif tag == "article":
+            self.depth -= 1
+            if self.depth == 0:
+                self.records.append(self.record)
+                self.record = None
+                self.h3 = 0
+                self.footer = 0
+
+    def handle_data(self, data):
+        if self.capture is not None:
+            self.buffer.append(data)
+
+    def __start_capture(self, field):
+        if self.capture is None:
+            self.capture = field
+            self.buffer = []
+
+    def __capture_tag(self):
+        return {
+            "title": "a",
+            "date": "span",
+            "summary": "p",
+        }[self.capture]
+
+    def __absolute(self, url):
+        if not url:
+            return None
+        return urljoin(self.base_url, url)
+
+
+def parse_articles(html, base_url):
+    parser = ArticleParser(base_url)
+    parser.feed(html)
+    parser.close()
+    return parser.records
+
+
+class HttpSearchBackend():
+    def __init__(
+        self,
+        url_template,
+        base_url,
+        timeout=15.0,
+        session=None,
+        archive=None,
+        logger=logger
+    ):
+        self.url_template = url_template
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.archive = archive
+        self.logger = logger
+
+    def search_url(self, query, page):
+        return self.url_template.format(
+            url=self.base_url.rstrip("/"),
+            query=quote(query),
+            page=page
+        )
+
+    def fetch_page(self, query, page):
+        url = self.search_url(query, page)
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise HttpSearchError(f"Unable to fetch {url}: {e}")
+        if response.status_code != 200:
+            retry_after = response.headers.get("Retry-After", "")
+            raise HttpSearchError(
+                f"Unable to fetch {url}. "
+                f"Status code: {response.status_code}",
+                status_code=response.status_code,
+                retry_after=float(retry_after)
+                if retry_after.isdigit() else None
+            )
+        self.logger.info(f"Fetched search results page {page}: {url}")
+        if self.archive is not None:
+            self.archive.save(query, page, response.text, response.url)
+        return parse_articles(response.text, response.url)
+
+    def search(self, query, start=1, first_page=1, last_page=None):
+        seen = set()
+        index = 0
+        page = first_page
+        while last_page is None or page <= last_page:
+            records = self.fetch_page(query, page)
+            fresh = [
+                record for record in records
+                if record["link"] not in seen
+            ]
+            if not fresh:
+                if page == 1 and start == 1:
+                    raise HttpSearchError(
+                        f"No articles found on the first results page for "
+                        f"{query!r}"
+                    )
+                return
+            for record in fresh:
+                seen.add(record["link"])
+                index += 1
+                if index < start:
+                    continue
+                record["index"] = index
+                yield record
+            page += 1
+
+    def close(self):
+        self.session.close()
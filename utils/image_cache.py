@@ -0,0 +1,179 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger("ImageCache")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    digest TEXT
+);
+CREATE TABLE IF NOT EXISTS objects (
+    digest TEXT PRIMARY KEY,
+    ext TEXT,
+    size INTEGER,
+    last_used REAL
+);
+CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest);
+CREATE INDEX IF NOT EXISTS objects_last_used ON objects (last_used);
+"""
+
+
+class ImageCache():
+    def __init__(
+        self,
+        path,
+        directory,
+        max_bytes=512 * 1024 * 1024,
+        logger=logger
+    ):
+        self.path = Path(path)
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self.evicted = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            self.path,
+            timeout=30.0,
+            check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def object_path(self, digest, ext):
+        return self.directory.joinpath(f"{digest}{ext}")
+
+    def lookup(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                """
+                SELECT e.etag, e.last_modified, e.digest, o.ext
+                FROM entries e JOIN objects o ON o.digest = e.digest
+                WHERE e.url = ?
+                """,
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, digest, ext = row
+        path = self.object_path(digest, ext)
+        if not path.is_file():
+            return None
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "digest": digest,
+            "path": str(path),
+        }
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is None:
+            return headers
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, entry):
+        with self.lock:
+            self.hits += 1
+            self.conn.execute(
+                "UPDATE objects SET last_used = ? WHERE digest = ?",
+                (time.time(), entry["digest"])
+            )
+            self.conn.commit()
+        return entry["path"]
+
+    def store(self, url, partial, digest, ext, size, headers):
+        path = self.object_path(digest, ext)
+        with self.lock:
+            self.misses += 1
+            if path.is_file():
+                self.deduplicated += 1
+                Path(partial).unlink(missing_ok=True)
+            else:
+                Path(partial).replace(path)
+            self.conn.execute(
+                """
+                INSERT INTO objects (digest, ext, size, last_used)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(digest) DO UPDATE SET
+                    last_used = excluded.last_used
+                """,
+                (digest, ext, size, time.time())
+            )
+            self.conn.execute(
+                """
+                INSERT INTO entries (url, etag, last_modified, digest)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    digest = excluded.digest
+                """,
+                (
+                    url,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    digest
+                )
+            )
+            self.conn.commit()
+            self.__evict()
+        return str(path)
+
+    def stats(self):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM objects"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "deduplicated": self.deduplicated,
+            "evicted": self.evicted,
+            "objects": row[0],
+            "bytes": row[1],
+        }
+
+    def close(self):
+        self.logger.info(f"Image cache stats: {self.stats()}")
+        with self.lock:
+            self.conn.close()
+
+    def __evict(self):
+        total = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM objects"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute(
+            "SELECT digest, ext, size FROM objects ORDER BY last_used"
+        ).fetchall()
+        for digest, ext, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.object_path(digest, ext).unlink(missing_ok=True)
+            self.conn.execute(
+                "DELETE FROM entries WHERE digest = ?", (digest,)
+            )
+            self.conn.execute(
+                "DELETE FROM objects WHERE digest = ?", (digest,)
+            )
+            total -= size
+            self.evicted += 1
+        self.conn.commit()
@@ -0,0 +1,187 @@
+import hashlib
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .logs import SAMPLED
+from .metrics import METRICS
+
+logger = logging.getLogger("ImageDownloader")
+
+SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+)
+
+CONTENT_TYPES = {
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/avif": ".avif",
+    "image/svg+xml": ".svg",
+    "image/bmp": ".bmp",
+}
+
+DEFAULT_EXTENSION = ".jpg"
+
+
+def detect_extension(head: bytes, content_type=None, url=None) -> str:
+    for signature, ext in SIGNATURES:
+        if head.startswith(signature):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:12] in (b"ftypavif", b"ftypavis"):
+        return ".avif"
+
+    if content_type:
+        mime = content_type.split(";")[0].strip().lower()
+        if mime in CONTENT_TYPES:
+            return CONTENT_TYPES[mime]
+
+    if url:
+        suffix = Path(urlparse(url).path).suffix.lower()
+        if suffix in CONTENT_TYPES.values() or suffix == ".jpeg":
+            return ".jpg" if suffix == ".jpeg" else suffix
+
+    return DEFAULT_EXTENSION
+
+
+class ImageDownloader():
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        img_dir,
+        workers=4,
+        retry_max=3,
+        timeout=15.0,
+        backoff=0.5,
+        cache=None,
+        logger=logger
+    ):
+        self.img_dir = Path(img_dir)
+        self.workers = max(int(workers), 1)
+        self.retry_max = max(int(retry_max), 1)
+        self.timeout = timeout
+        self.backoff = backoff
+        self.cache = cache
+        self.logger = logger
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.workers,
+            pool_maxsize=self.workers
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="img-download"
+        )
+
+    def submit(self, link, file_name):
+        return self.executor.submit(self.download, link, file_name)
+
+    def download(self, link, file_name):
+        if not link:
+            return None
+        with METRICS.timer("image.download"):
+            return self.__download(link, file_name)
+
+    def __download(self, link, file_name):
+        entry = None
+        headers = {}
+        if self.cache is not None:
+            entry = self.cache.lookup(link)
+            headers = self.cache.conditional_headers(entry)
+        for attempt in range(self.retry_max):
+            try:
+                with self.session.get(
+                    link,
+                    headers=headers,
+                    stream=True,
+                    timeout=self.timeout
+                ) as response:
+                    if response.status_code == 304 and entry is not None:
+                        save_to = self.cache.hit(entry)
+                        METRICS.count("image.not_modified")
+                        self.logger.info(
+                            f"Image not modified: {save_to}", extra=SAMPLED
+                        )
+                        return save_to
+                    if response.status_code == 200:
+                        save_to = self.__save(response, link, file_name)
+                        METRICS.count("image.downloaded")
+                        self.logger.info(
+                            f"Image successfully downloaded: {save_to}",
+                            extra=SAMPLED
+                        )
+                        return save_to
+                    self.logger.warning(
+                        f"Failed to download image {link}. "
+                        f"Status code: {response.status_code}"
+                    )
+            except requests.RequestException as e:
+                self.logger.warning(f"Failed to download image {link}. {e}")
+
+            if attempt < self.retry_max - 1:
+                time.sleep(self.__backoff(attempt))
+
+        METRICS.count("image.failed")
+        self.logger.error(
+            f"Unable to download image {link} after "
+            f"{self.retry_max} attempts"
+        )
+        return None
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __backoff(self, attempt):
+        delay = self.backoff * (2 ** attempt)
+        return delay + random.uniform(0, self.backoff)
+
+    def __save(self, response, link, file_name):
+        chunks = response.iter_content(chunk_size=self.CHUNK_SIZE)
+        head = next(chunks, b"")
+        ext = detect_extension(
+            head,
+            response.headers.get("Content-Type"),
+            response.url
+        )
+        save_to = self.img_dir.joinpath(f"{file_name}{ext}")
+        partial = save_to.with_name(f"{save_to.name}.part")
+        digest = hashlib.sha256(head)
+        size = len(head)
+        with open(partial, "wb") as file:
+            file.write(head)
+            for chunk in chunks:
+                file.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        METRICS.count("image.bytes", size)
+        if self.cache is not None:
+            return self.cache.store(
+                link,
+                partial,
+                digest.hexdigest(),
+                ext,
+                size,
+                response.headers
+            )
+        partial.replace(save_to)
+        return str(save_to)
@@ -0,0 +1,171 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+SAMPLED = {"sampled": True}
+
+RECORD_FIELDS = set(vars(logging.LogRecord(
+    "", logging.INFO, "", 0, "", None, None
+))) | {"message", "asctime", "sampled"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingQueueHandler(QueueHandler):
+    def __init__(self, log_queue, sample_every=1, aggregate_interval=30.0):
+        super().__init__(log_queue)
+        self.sample_every = max(int(sample_every), 1)
+        self.aggregate_interval = aggregate_interval
+        self.seen = {}
+        self.suppressed = {}
+        self.last_summary = time.monotonic()
+        self.sampling_lock = threading.Lock()
+
+    def emit(self, record):
+        with self.sampling_lock:
+            keep = self.__keep(record)
+            self.__summarize()
+        if keep:
+            super().emit(record)
+
+    def __keep(self, record):
+        if (
+            not getattr(record, "sampled", False)
+            or record.levelno >= logging.WARNING
+            or self.sample_every == 1
+        ):
+            return True
+        seen = self.seen.get(record.name, 0) + 1
+        self.seen[record.name] = seen
+        if seen % self.sample_every == 1:
+            return True
+        self.suppressed[record.name] = self.suppressed.get(record.name, 0) + 1
+        return False
+
+    def flush_summary(self):
+        with self.sampling_lock:
+            self.__summarize(force=True)
+
+    def __summarize(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.last_summary < self.aggregate_interval:
+            return
+        self.last_summary = now
+        suppressed, self.suppressed = self.suppressed, {}
+        for name, count in suppressed.items():
+            record = logging.LogRecord(
+                name, logging.INFO, __file__, 0,
+                f"Sampled out {count} per-article messages",
+                None, None
+            )
+            record.suppressed = count
+            super().emit(record)
+
+
+class LogService():
+    def __init__(self):
+        self.queue = None
+        self.handler = None
+        self.listener = None
+
+    def start(
+        self,
+        log_file,
+        level=logging.INFO,
+        file_format="json",
+        sample_every=1,
+        aggregate_interval=30.0
+    ):
+        if self.handler is not None:
+            return self.handler
+        os.makedirs(os.path.dirname(log_file) or ".", exist_ok=True)
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+        file = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+        if file_format == "json":
+            file.setFormatter(JsonFormatter())
+        else:
+            file.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+        self.queue = queue.SimpleQueue()
+        self.handler = SamplingQueueHandler(
+            self.queue,
+            sample_every=sample_every,
+            aggregate_interval=aggregate_interval
+        )
+        self.listener = QueueListener(
+            self.queue, console, file, respect_handler_level=True
+        )
+        self.listener.start()
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(self.handler)
+        atexit.register(self.stop)
+        os.register_at_fork(after_in_child=self.__restart_in_child)
+        return self.handler
+
+    def __restart_in_child(self):
+        if self.handler is None:
+            return
+        self.queue = queue.SimpleQueue()
+        self.handler.queue = self.queue
+        self.handler.sampling_lock = threading.Lock()
+        self.listener = QueueListener(
+            self.queue, *self.listener.handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def stop(self):
+        if self.handler is None:
+            return
+        self.handler.flush_summary()
+        logging.getLogger().removeHandler(self.handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.handler = None
+        self.listener = None
+
+
+LOGS = LogService()
+
+
+def configure_logging(
+    log_file,
+    level=None,
+    file_format=None,
+    sample_every=None,
+    aggregate_interval=None
+):
+    return LOGS.start(
+        log_file,
+        level=level or os.getenv("LOG_LEVEL", "INFO").upper(),
+        file_format=file_format or os.getenv("LOG_FILE_FORMAT", "json"),
+        sample_every=sample_every or int(os.getenv("LOG_SAMPLE_EVERY", 1)),
+        aggregate_interval=aggregate_interval or float(
+            os.getenv("LOG_AGGREGATE_INTERVAL", 30)
+        )
+    )
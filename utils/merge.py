@@ -0,0 +1,81 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+from .article import load_msgpack, payload_row, row_payload
+
+logger = logging.getLogger("MergeSpool")
+
+
+def merge_records(records):
+    unique = {}
+    for record in records:
+        unique.setdefault(record["slug"], record)
+    return sorted(
+        unique.values(),
+        key=lambda record: record["date"],
+        reverse=True
+    )
+
+
+class MergeSpool():
+    def __init__(self, path, encoding="json", logger=logger):
+        self.path = Path(path)
+        self.encoding = encoding
+        self.logger = logger
+        if encoding == "msgpack":
+            self.msgpack = load_msgpack()
+            self.path = self.path.with_suffix(".msgpack")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def append(self, records):
+        if self.encoding == "msgpack":
+            return self.__append_rows(records)
+        with open(self.path, "a", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def __append_rows(self, records):
+        packer = self.msgpack.Packer(use_bin_type=True)
+        with open(self.path, "ab") as file:
+            for record in records:
+                file.write(packer.pack(payload_row(record)))
+            file.flush()
+            os.fsync(file.fileno())
+
+    def __read_rows(self):
+        records = []
+        with open(self.path, "rb") as file:
+            unpacker = self.msgpack.Unpacker(file, raw=False)
+            try:
+                for row in unpacker:
+                    records.append(row_payload(row))
+            except ValueError:
+                self.logger.warning(
+                    f"Skipping truncated record in {self.path}."
+                )
+        return records
+
+    def read(self):
+        if not self.path.exists():
+            return []
+        if self.encoding == "msgpack":
+            return self.__read_rows()
+        records = []
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    self.logger.warning(
+                        f"Skipping truncated record in {self.path}."
+                    )
+        return records
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,146 @@
+import functools
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+SAMPLE_SIZE = 1024
+
+
+class Stage():
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        if len(self.samples) < SAMPLE_SIZE:
+            self.samples.append(seconds)
+        else:
+            slot = random.randrange(self.count)
+            if slot < SAMPLE_SIZE:
+                self.samples[slot] = seconds
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+            "p50_seconds": self.percentile(50),
+            "p95_seconds": self.percentile(95),
+        }
+
+
+class Metrics():
+    def __init__(self, prefix="rpa_news"):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.started = time.time()
+
+    def observe(self, stage, seconds):
+        with self.lock:
+            self.stages.setdefault(stage, Stage()).observe(seconds)
+
+    def count(self, counter, value=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self):
+        with self.lock:
+            return {
+                "started": datetime.fromtimestamp(self.started).isoformat(),
+                "elapsed_seconds": time.time() - self.started,
+                "stages": {
+                    name: stage.summary()
+                    for name, stage in sorted(self.stages.items())
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def prometheus(self, job):
+        summary = self.summary()
+        lines = []
+        metric = f"{self.prefix}_stage_seconds"
+        lines.append(f"# TYPE {metric} summary")
+        for name, stage in summary["stages"].items():
+            labels = f'job="{job}",stage="{name}"'
+            for quantile in ("50", "95"):
+                value = stage[f"p{quantile}_seconds"]
+                lines.append(
+                    f'{metric}{{{labels},quantile="0.{quantile}"}} {value}'
+                )
+            lines.append(f"{metric}_sum{{{labels}}} {stage['total_seconds']}")
+            lines.append(f"{metric}_count{{{labels}}} {stage['count']}")
+        for name, value in summary["counters"].items():
+            counter = f"{self.prefix}_{sanitize(name)}_total"
+            lines.append(f"# TYPE {counter} counter")
+            lines.append(f'{counter}{{job="{job}"}} {value}')
+        elapsed = f"{self.prefix}_run_seconds"
+        lines.append(f"# TYPE {elapsed} gauge")
+        lines.append(f'{elapsed}{{job="{job}"}} {summary["elapsed_seconds"]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory, job):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        summary_file = directory.joinpath(f"metrics-{job}.json")
+        write_atomic(summary_file, json.dumps(self.summary(), indent=2))
+        prom_file = directory.joinpath(f"metrics-{job}.prom")
+        write_atomic(prom_file, self.prometheus(job))
+        return str(summary_file), str(prom_file)
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.counters = {}
+            self.started = time.time()
+
+
+def write_atomic(path, content):
+    partial = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.part"
+    )
+    partial.write_text(content, encoding="utf-8")
+    os.replace(partial, path)
+
+
+def sanitize(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+METRICS = Metrics()
@@ -1,5 +1,5 @@
-def new_counter():
-    count: int = 0
+def new_counter(start: int = 0):
+    count: int = start
 
     def increment() -> int:
         nonlocal count
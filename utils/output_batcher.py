@@ -0,0 +1,77 @@
+import logging
+import time
+
+from .article import decode_records, encode_records
+from .metrics import METRICS
+
+logger = logging.getLogger("OutputBatcher")
+
+RECORDS_KEY = "records"
+
+
+class OutputBatcher():
+    def __init__(
+        self,
+        outputs,
+        batch_size=100,
+        flush_interval=10.0,
+        on_flush=None,
+        encoding="json",
+        logger=logger
+    ):
+        self.outputs = outputs
+        self.batch_size = max(int(batch_size), 1)
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.encoding = encoding
+        self.logger = logger
+        self.buffer = []
+        self.batches = 0
+        self.records = 0
+        self.last_flush = time.monotonic()
+
+    def add(self, payload, marker=None):
+        self.buffer.append((payload, marker))
+        if (
+            len(self.buffer) >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return 0
+        entries = self.buffer
+        payloads = [payload for payload, _ in entries]
+        with METRICS.timer("workitem.create"):
+            if self.batch_size == 1:
+                self.outputs.create(payload=payloads[0])
+            else:
+                self.outputs.create(
+                    payload=encode_records(payloads, self.encoding)
+                )
+        self.buffer = []
+        self.batches += 1
+        self.records += len(entries)
+        self.last_flush = time.monotonic()
+        METRICS.count("workitem.batches")
+        if self.batch_size > 1:
+            self.logger.info(
+                f"Created output work item with {len(entries)} records."
+            )
+        if self.on_flush is not None:
+            self.on_flush(entries)
+        return len(entries)
+
+    def close(self):
+        return self.flush()
+
+
+def batch_records(payload):
+    if isinstance(payload, dict) and RECORDS_KEY in payload:
+        return decode_records(payload)
+    return [payload]
+
+
+def is_batch(payload):
+    return isinstance(payload, dict) and RECORDS_KEY in payload
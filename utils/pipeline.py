@@ -0,0 +1,69 @@
+import logging
+import queue
+import threading
+
+from .metrics import METRICS
+
+logger = logging.getLogger("Pipeline")
+
+_END = object()
+
+
+class PipelineAborted(Exception):
+    pass
+
+
+class RecordQueue():
+    def __init__(self, maxsize=100, poll_interval=0.5, logger=logger):
+        self.queue = queue.Queue(maxsize=max(int(maxsize), 1))
+        self.poll_interval = poll_interval
+        self.logger = logger
+        self.error = None
+        self.closed = threading.Event()
+        self.created = 0
+        self.blocked = 0
+
+    def create(self, payload):
+        if self.closed.is_set():
+            raise PipelineAborted("Record queue is closed")
+        if self.queue.full():
+            self.blocked += 1
+            METRICS.count("pipeline.backpressure")
+        with METRICS.timer("pipeline.put"):
+            while True:
+                if self.error is not None:
+                    raise PipelineAborted(
+                        f"Consumer stage failed: {self.error}"
+                    )
+                try:
+                    self.queue.put(payload, timeout=self.poll_interval)
+                    break
+                except queue.Full:
+                    continue
+        self.created += 1
+
+    def close(self):
+        if self.closed.is_set():
+            return
+        self.closed.set()
+        while self.error is None:
+            try:
+                self.queue.put(_END, timeout=self.poll_interval)
+                return
+            except queue.Full:
+                continue
+
+    def abort(self, error):
+        self.error = error
+        self.closed.set()
+        self.logger.error(f"Pipeline aborted: {error}")
+
+    def __iter__(self):
+        while True:
+            payload = self.queue.get()
+            if payload is _END:
+                return
+            yield payload
+
+    def __len__(self):
+        return self.created
@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+
+def first_day(day, months_back=0):
+    month = day.month - 1 - months_back
+    year = day.year + month // 12
+    return date(year, month % 12 + 1, 1)
+
+
+def month_windows(months, window_months, today=None):
+    today = today or date.today()
+    months = max(int(months), 1)
+    oldest = first_day(today, months - 1)
+    if window_months <= 0:
+        return [(oldest, today)]
+    windows = []
+    until = today
+    offset = 0
+    while until >= oldest:
+        offset += window_months
+        since = max(first_day(today, offset - 1), oldest)
+        windows.append((since, until))
+        until = since - timedelta(days=1)
+    return windows
+
+
+def find_last_page(in_range, max_page=10000):
+    if not in_range(1):
+        return 0
+    low, high = 1, 2
+    while high <= max_page and in_range(high):
+        low, high = high, high * 2
+    high = min(high, max_page + 1)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if in_range(middle):
+            low = middle
+        else:
+            high = middle
+    return low
+
+
+def page_ranges(last_page, shards):
+    shards = max(min(int(shards), int(last_page)), 1)
+    size, extra = divmod(max(int(last_page), 1), shards)
+    firsts = [1]
+    for number in range(shards - 1):
+        firsts.append(firsts[-1] + size + (number < extra))
+    return [
+        (first, firsts[number + 1] if number + 1 < shards else None)
+        for number, first in enumerate(firsts)
+    ]
+
+
+def shard_queries(payload, variants=None):
+    return list(dict.fromkeys(
+        variants or payload.get("variants") or [payload["query"]]
+    ))
+
+
+def plan_shards(
+    payload,
+    window_months=1,
+    variants=None,
+    today=None,
+    pages=None
+):
+    pages = pages or {}
+    shards = []
+    for query in shard_queries(payload, variants):
+        ranges = pages.get(query) or [(1, None)]
+        windows = month_windows(
+            payload["months"],
+            0 if query in pages else window_months,
+            today
+        )
+        for since, until in windows:
+            for first_page, last_page in ranges:
+                shard = {
+                    "query": query,
+                    "topic": payload["topic"],
+                    "months": payload["months"],
+                    "since": since.isoformat(),
+                    "until": until.isoformat(),
+                }
+                if query in pages:
+                    shard["first_page"] = first_page
+                    shard["last_page"] = last_page
+                shards.append(shard)
+    for number, shard in enumerate(shards, start=1):
+        shard["shard"] = f"{number}/{len(shards)}"
+    return shards
@@ -0,0 +1,274 @@
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from .metrics import write_atomic
+
+logger = logging.getLogger("Profiler")
+
+MODES = ("off", "cprofile", "sampling")
+IGNORED = (tracemalloc.__file__, __file__)
+
+
+def frame_name(filename, line, function):
+    return f"{function} ({Path(filename).name}:{line})"
+
+
+class AllocationStats():
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.peak = 0
+        self.lines = Counter()
+
+    def observe(self, before, after, top):
+        self.count += 1
+        diff = [
+            stat for stat in after.compare_to(before, "lineno")
+            if stat.traceback[0].filename not in IGNORED
+        ]
+        growth = sum(stat.size_diff for stat in diff)
+        self.total += growth
+        self.peak = max(self.peak, growth)
+        for stat in diff[:top]:
+            frame = stat.traceback[0]
+            self.lines[f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+
+
+class Sampler():
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.__run, name="profile-sampler", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __run(self):
+        own = threading.get_ident()
+        names = {}
+        while not self.stopped.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(frame_name(
+                        code.co_filename, code.co_firstlineno, code.co_name
+                    ))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self):
+        return self.stacks
+
+    def report(self, top):
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for frame in set(frames[1:]):
+                inclusive[frame] += count
+        total = sum(self.stacks.values()) or 1
+        lines = [f"{self.samples} samples every {self.interval * 1000:g} ms"]
+        for title, counter in (("self", own), ("inclusive", inclusive)):
+            lines.append("")
+            lines.append(f"Top {top} functions by {title} samples:")
+            for frame, count in counter.most_common(top):
+                lines.append(f"{count:>8} {count / total:7.1%}  {frame}")
+        return "\n".join(lines)
+
+
+def folded_from_stats(stats, max_depth=64, min_seconds=0.0001):
+    stacks = Counter()
+    callers = {
+        func: entry[4] for func, entry in stats.stats.items()
+    }
+    callees = {}
+    for func, parents in callers.items():
+        for parent, entry in parents.items():
+            callees.setdefault(parent, []).append((func, entry[3]))
+
+    def walk(func, path, share):
+        _, _, own, total, _ = stats.stats[func]
+        if total * share < min_seconds:
+            return
+        path = path + [frame_name(*func)]
+        stacks[";".join(path)] += int(own * share * 1_000_000)
+        if len(path) >= max_depth:
+            return
+        for child, cumulative in callees.get(func, []):
+            if frame_name(*child) in path or child not in stats.stats:
+                continue
+            child_total = stats.stats[child][3]
+            if child_total > 0:
+                walk(child, path, share * cumulative / child_total)
+
+    for func in stats.stats:
+        if not callers[func]:
+            walk(func, [], 1.0)
+    return Counter({stack: count for stack, count in stacks.items() if count})
+
+
+class Profiler():
+    def __init__(self):
+        self.mode = "off"
+        self.top = 30
+        self.interval = 0.005
+        self.memory = False
+        self.frames = 1
+        self.logger = logger
+        self.profiler = None
+        self.sampler = None
+        self.allocations = {}
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def configure(self, logger=logger):
+        self.mode = os.getenv("PROFILE", "off")
+        if self.mode not in MODES:
+            logger.warning(f"Unknown PROFILE mode {self.mode}, disabling.")
+            self.mode = "off"
+        self.top = int(os.getenv("PROFILE_TOP", 30))
+        self.interval = float(os.getenv("PROFILE_INTERVAL", 0.005))
+        self.memory = self.enabled and (
+            os.getenv("PROFILE_TRACEMALLOC", "on") != "off"
+        )
+        self.frames = int(os.getenv("PROFILE_TRACEMALLOC_FRAMES", 1))
+        self.logger = logger
+        return self
+
+    def start(self):
+        if self.mode == "cprofile":
+            import cProfile
+
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.mode == "sampling":
+            self.sampler = Sampler(self.interval)
+            self.sampler.start()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        if self.enabled:
+            self.logger.info(f"Profiling with {self.mode}.")
+
+    def stop(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+
+    @contextmanager
+    def profile(self, task, directory="output", logger=logger):
+        self.configure(logger)
+        if not self.enabled:
+            yield self
+            return
+        self.start()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.stop()
+            files = self.write(directory, task, time.perf_counter() - start)
+            self.logger.info(f"Profile written to {', '.join(files)}")
+
+    @contextmanager
+    def track(self, label):
+        if not self.memory or not tracemalloc.is_tracing():
+            yield
+            return
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            with self.lock:
+                stats = self.allocations.setdefault(label, AllocationStats())
+                stats.observe(before, after, self.top)
+
+    def memory_report(self):
+        lines = []
+        with self.lock:
+            allocations = sorted(self.allocations.items())
+        for label, stats in allocations:
+            lines.append("")
+            lines.append(
+                f"Allocations in {label}: {stats.count} snapshots, "
+                f"{stats.total / 1024:.1f} KiB net, "
+                f"{stats.peak / 1024:.1f} KiB largest growth"
+            )
+            for line, size in stats.lines.most_common(self.top):
+                lines.append(f"{size / 1024:>10.1f} KiB  {line}")
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append("")
+            lines.append(
+                f"Traced memory: {current / 1024:.1f} KiB current, "
+                f"{peak / 1024:.1f} KiB peak"
+            )
+        return "\n".join(lines)
+
+    def write(self, directory, task, elapsed):
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        files = []
+        header = f"{task} profiled with {self.mode} for {elapsed:.1f}s"
+        if self.profiler is not None:
+            import pstats
+            from io import StringIO
+
+            stats_file = directory.joinpath(f"profile-{task}.pstats")
+            self.profiler.dump_stats(stats_file)
+            files.append(str(stats_file))
+            stream = StringIO()
+            stats = pstats.Stats(self.profiler, stream=stream)
+            stats.sort_stats("cumulative").print_stats(self.top)
+            stats.sort_stats("tottime").print_stats(self.top)
+            folded = folded_from_stats(stats)
+            report = stream.getvalue()
+        else:
+            folded = self.sampler.folded()
+            report = self.sampler.report(self.top)
+        memory = self.memory_report()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        folded_file = directory.joinpath(f"profile-{task}.folded")
+        write_atomic(folded_file, "".join(
+            f"{stack} {count}\n" for stack, count in folded.most_common()
+        ))
+        files.append(str(folded_file))
+        report_file = directory.joinpath(f"profile-{task}.txt")
+        write_atomic(report_file, "\n".join([header, report, memory]) + "\n")
+        files.append(str(report_file))
+        self.profiler = None
+        self.sampler = None
+        return files
+
+
+PROFILER = Profiler()
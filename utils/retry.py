@@ -1,22 +1,262 @@
+import functools
+import os
+import random
+import threading
+import time
 import traceback
 import logging
 
+from .metrics import METRICS
+
 logger = logging.getLogger("Retry")
 
+_context = threading.local()
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class RetryBudgetExceeded(Exception):
+    pass
+
+
+class CircuitBreaker():
+    def __init__(
+        self,
+        name="default",
+        threshold=10,
+        reset_timeout=60.0,
+        logger=logger
+    ):
+        self.name = name
+        self.threshold = max(int(threshold), 1)
+        self.reset_timeout = reset_timeout
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def is_open(self):
+        with self.lock:
+            return (
+                self.opened_at is not None
+                and time.monotonic() - self.opened_at < self.reset_timeout
+            )
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(
+                    f"Circuit {self.name} is open after "
+                    f"{self.failures} consecutive failures"
+                )
+            if self.trial:
+                raise CircuitOpenError(
+                    f"Circuit {self.name} is waiting on a trial call"
+                )
+            self.trial = True
+            self.logger.info(f"Circuit {self.name} half-open, trying again")
+
+    def success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                self.logger.info(f"Circuit {self.name} closed")
+            self.failures = 0
+            self.opened_at = None
+            self.trial = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.trial or self.failures >= self.threshold:
+                if self.opened_at is None or self.trial:
+                    METRICS.count(f"circuit.{self.name}.opened")
+                    self.logger.error(
+                        f"Circuit {self.name} opened after "
+                        f"{self.failures} consecutive failures"
+                    )
+                self.opened_at = time.monotonic()
+                self.trial = False
+
+
+class RetryPolicy():
+    def __init__(
+        self,
+        attempts=3,
+        base_delay=0.5,
+        max_delay=30.0,
+        multiplier=2.0,
+        jitter=1.0,
+        budget=None,
+        retry_on=(Exception,),
+        abort_on=(),
+        classify=None,
+        breaker=None
+    ):
+        self.attempts = max(int(attempts), 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.budget = budget
+        self.retry_on = tuple(retry_on)
+        self.abort_on = tuple(abort_on)
+        self.classify = classify
+        self.breaker = breaker
+
+    @classmethod
+    def from_env(cls, prefix="RETRY", **overrides):
+        budget = float(os.getenv(f"{prefix}_BUDGET", 0)) or None
+        settings = {
+            "attempts": int(os.getenv(f"{prefix}_MAX", 3)),
+            "base_delay": float(os.getenv(f"{prefix}_BASE_DELAY", 0.5)),
+            "max_delay": float(os.getenv(f"{prefix}_MAX_DELAY", 30.0)),
+            "budget": budget,
+        }
+        settings.update(overrides)
+        return cls(**settings)
+
+    def replace(self, **changes):
+        settings = dict(vars(self))
+        settings.update(changes)
+        return RetryPolicy(**settings)
+
+    def delay(self, attempt, error=None):
+        delay = min(
+            self.base_delay * self.multiplier ** attempt,
+            self.max_delay
+        )
+        delay -= delay * self.jitter * random.random()
+        retry_after = next((
+            cause.retry_after for cause in exception_chain(error)
+            if getattr(cause, "retry_after", None)
+        ), None)
+        if retry_after:
+            delay = max(delay, min(float(retry_after), self.max_delay))
+        return delay
+
+    def retryable(self, error):
+        for cause in exception_chain(error):
+            if isinstance(cause, CircuitOpenError):
+                return False
+            if isinstance(cause, RetryBudgetExceeded):
+                return False
+            if getattr(cause, "retry_exhausted", False):
+                return False
+            if isinstance(cause, self.abort_on):
+                return False
+        if self.classify is not None:
+            for cause in exception_chain(error):
+                verdict = self.classify(cause)
+                if verdict is not None:
+                    return verdict
+        return isinstance(error, self.retry_on)
+
+
+def exception_chain(error):
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def caused_by(error, types):
+    return any(isinstance(cause, types) for cause in exception_chain(error))
+
+
+def retry(retry_max=5, logger=logger, policy=None):
+    policy = policy or RetryPolicy(attempts=retry_max, base_delay=0.0)
 
-def retry(retry_max=5, logger=logger):
     def decorator(func):
+        name = func.__name__.strip("_")
+
+        @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            for i in range(retry_max):
+            outer = getattr(_context, "deadline", None)
+            deadline = outer
+            if policy.budget:
+                deadline = min(
+                    outer or float("inf"),
+                    time.monotonic() + policy.budget
+                )
+            _context.deadline = deadline
+            try:
+                with METRICS.timer(f"retry.{name}"):
+                    return attempt(name, func, args, kwargs, deadline)
+            finally:
+                _context.deadline = outer
+
+        def attempt(name, func, args, kwargs, deadline):
+            for i in range(policy.attempts):
+                METRICS.count(f"retry.{name}.attempts")
                 try:
+                    if policy.breaker is not None:
+                        policy.breaker.allow()
                     result = func(*args, **kwargs)
+                    if policy.breaker is not None:
+                        policy.breaker.success()
                     return result
                 except Exception as e:
+                    METRICS.count(f"retry.{name}.failures")
                     logger.error(
-                        f"{func.__name__} failed with error: {type(e)} - {e}"
+                        f"{func.__name__} failed with error: "
+                        f"{type(e)} - {e}"
                     )
-                    if i == retry_max - 1:
+                    if policy.breaker is not None and not recorded(e):
+                        policy.breaker.failure()
+                    if not policy.retryable(e):
+                        METRICS.count(f"retry.{name}.aborted")
+                        logger.error(
+                            f"{func.__name__} failed with a non-retryable "
+                            f"error, giving up after {i + 1} attempts"
+                        )
+                        raise e
+                    if i == policy.attempts - 1:
                         logger.error(traceback.format_exc())
+                        mark_exhausted(e)
                         raise e
+                    delay = policy.delay(i, e)
+                    if (
+                        deadline is not None
+                        and time.monotonic() + delay > deadline
+                    ):
+                        METRICS.count(f"retry.{name}.budget_exceeded")
+                        mark_exhausted(e)
+                        raise RetryBudgetExceeded(
+                            f"{func.__name__} ran out of retry budget "
+                            f"after {i + 1} attempts"
+                        ) from e
+                    if delay > 0:
+                        logger.info(
+                            f"Retrying {func.__name__} in {delay:.2f}s "
+                            f"(attempt {i + 2}/{policy.attempts})"
+                        )
+                        time.sleep(delay)
         return wrapper
     return decorator
+
+
+def recorded(error):
+    for cause in exception_chain(error):
+        if isinstance(cause, CircuitOpenError):
+            return True
+        if getattr(cause, "breaker_recorded", False):
+            return True
+    try:
+        error.breaker_recorded = True
+    except AttributeError:
+        pass
+    return False
+
+
+def mark_exhausted(error):
+    try:
+        error.retry_exhausted = True
+    except AttributeError:
+        pass
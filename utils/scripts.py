@@ -0,0 +1,45 @@
+EXTRACT_ARTICLES_JS = """
+const [locator, start] = arguments;
+const snapshot = document.evaluate(
+    locator, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const prop = (root, selector, name) => {
+    const node = root.querySelector(selector);
+    return node ? node[name] : null;
+};
+const records = [];
+for (let i = start - 1; i < snapshot.snapshotLength; i++) {
+    const article = snapshot.snapshotItem(i);
+    records.push({
+        index: i + 1,
+        link: prop(article, "h3 a", "href"),
+        title: prop(article, "h3 a", "innerText"),
+        date: prop(article, "footer span[aria-hidden]", "innerText"),
+        summary: prop(article, "p", "innerText"),
+        img: prop(article, "img", "src"),
+        alt: prop(article, "img", "alt"),
+    });
+}
+if (records.length) {
+    snapshot.snapshotItem(snapshot.snapshotLength - 1).scrollIntoView();
+}
+return records;
+"""
+
+PRUNE_ARTICLES_JS = """
+const [locator, count, mode] = arguments;
+const snapshot = document.evaluate(
+    locator, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+);
+const total = Math.min(count, snapshot.snapshotLength);
+for (let i = 0; i < total; i++) {
+    const article = snapshot.snapshotItem(i);
+    if (mode === "detach") {
+        article.remove();
+    } else {
+        article.setAttribute("data-rpa-done", "1");
+        article.replaceChildren();
+    }
+}
+return total;
+"""
@@ -0,0 +1,32 @@
+import json
+import os
+from pathlib import Path
+
+
+class SessionOutputs():
+    def __init__(self, session, directory):
+        self.session = session
+        self.records = []
+        self.path = Path(directory).joinpath(f"session-{session}.jsonl")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("")
+
+    def create(self, payload=None):
+        self.records.append(payload)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(payload) + "\n")
+        return payload
+
+    def __len__(self):
+        return len(self.records)
+
+
+def read_input_payloads():
+    if os.getenv("RC_WORKITEM_ADAPTER") != "FileAdapter":
+        return None
+    path = os.getenv("RC_WORKITEM_INPUT_PATH")
+    if not path or not Path(path).is_file():
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        items = json.load(file)
+    return [item.get("payload") for item in items]
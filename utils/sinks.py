@@ -0,0 +1,285 @@
+import csv
+import json
+import logging
+import os
+from pathlib import Path
+
+from .excel_writer import StreamingExcelWriter
+from .metrics import METRICS
+
+logger = logging.getLogger("Sinks")
+
+COLUMNS = [
+    "title",
+    "date",
+    "description",
+    "picture_filename",
+    "phrase_count_in_title",
+    "money_related",
+    "url",
+    "slug",
+    "image",
+]
+
+EXCEL_COLUMNS = COLUMNS[:6]
+
+
+def row_from_payload(payload):
+    return {
+        "title": payload["title"],
+        "date": payload["date"],
+        "description": payload["description"],
+        "picture_filename": payload["file"],
+        "phrase_count_in_title": payload["count"],
+        "money_related": payload["matches-currency"],
+        "url": payload.get("url"),
+        "slug": payload["slug"],
+        "image": payload.get("image"),
+    }
+
+
+class ExcelSink():
+    suffix = ".xlsx"
+    durable_flush = True
+
+    def __init__(
+        self,
+        path,
+        sheet_name="data",
+        batch_size=500,
+        flush_interval=30.0,
+        logger=logger,
+        **options
+    ):
+        self.path = Path(path)
+        self.writer = StreamingExcelWriter(
+            path=self.path,
+            sheet_name=sheet_name,
+            header=EXCEL_COLUMNS,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            logger=logger
+        )
+
+    def open(self):
+        self.writer.open()
+        return self
+
+    def append(self, row):
+        self.writer.append([row[column] for column in EXCEL_COLUMNS])
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+
+class JsonlSink():
+    suffix = ".jsonl"
+    durable_flush = True
+
+    def __init__(self, path, batch_size=500, logger=logger, **options):
+        self.path = Path(path)
+        self.batch_size = max(int(batch_size), 1)
+        self.logger = logger
+        self.file = None
+        self.pending = 0
+        self.rows = 0
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8")
+        return self
+
+    def append(self, row):
+        self.file.write(json.dumps(row, default=str) + "\n")
+        self.pending += 1
+        self.rows += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.file is None or not self.pending:
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+        self.logger.info(f"Saved {self.rows} rows to {self.path}.")
+
+
+class CsvSink(JsonlSink):
+    suffix = ".csv"
+
+    def __init__(self, path, batch_size=500, logger=logger, **options):
+        super().__init__(path, batch_size=batch_size, logger=logger)
+        self.writer = None
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        exists = self.path.exists() and self.path.stat().st_size > 0
+        self.file = open(self.path, "a", encoding="utf-8", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        if not exists:
+            self.writer.writeheader()
+        return self
+
+    def append(self, row):
+        self.writer.writerow(row)
+        self.pending += 1
+        self.rows += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+
+class ParquetSink():
+    suffix = ".parquet"
+    durable_flush = False
+
+    def __init__(self, path, row_group_size=10000, logger=logger, **options):
+        self.path = Path(path)
+        self.partial = self.path.with_name(f"{self.path.name}.part")
+        self.row_group_size = max(int(row_group_size), 1)
+        self.logger = logger
+        self.pa = None
+        self.writer = None
+        self.schema = None
+        self.buffer = []
+        self.rows = 0
+
+    def open(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "The parquet sink requires pyarrow to be installed."
+            ) from e
+        self.pa = pa
+        self.schema = pa.schema([
+            ("title", pa.string()),
+            ("date", pa.string()),
+            ("description", pa.string()),
+            ("picture_filename", pa.string()),
+            ("phrase_count_in_title", pa.int64()),
+            ("money_related", pa.bool_()),
+            ("url", pa.string()),
+            ("slug", pa.string()),
+            ("image", pa.string()),
+        ])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = pq.ParquetWriter(self.partial, self.schema)
+        return self
+
+    def append(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if self.writer is None or not self.buffer:
+            return
+        table = self.pa.Table.from_pylist(self.buffer, schema=self.schema)
+        self.writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        if self.writer is None:
+            return
+        self.flush()
+        self.writer.close()
+        self.writer = None
+        os.replace(self.partial, self.path)
+        self.logger.info(f"Saved {self.rows} rows to {self.path}.")
+
+
+SINKS = {
+    "excel": ExcelSink,
+    "jsonl": JsonlSink,
+    "csv": CsvSink,
+    "parquet": ParquetSink,
+}
+
+
+class SinkSet():
+    def __init__(self, sinks, logger=logger):
+        self.sinks = sinks
+        self.logger = logger
+
+    @classmethod
+    def from_names(
+        cls,
+        names,
+        directory,
+        file_name,
+        logger=logger,
+        **options
+    ):
+        sinks = []
+        for name in names:
+            if name not in SINKS:
+                raise ValueError(
+                    f"Unknown output sink {name}. "
+                    f"Available sinks: {', '.join(SINKS)}"
+                )
+            sink = SINKS[name]
+            path = Path(directory).joinpath(f"{file_name}{sink.suffix}")
+            sinks.append(sink(path, logger=logger, **options))
+        return cls(sinks, logger=logger)
+
+    @property
+    def paths(self):
+        return [str(sink.path) for sink in self.sinks]
+
+    @property
+    def durable_flush(self):
+        return all(sink.durable_flush for sink in self.sinks)
+
+    def open(self):
+        opened = []
+        try:
+            for sink in self.sinks:
+                sink.open()
+                opened.append(sink)
+        except Exception:
+            for sink in opened:
+                sink.close()
+            raise
+        return self
+
+    def append(self, payload):
+        row = row_from_payload(payload)
+        for sink in self.sinks:
+            with METRICS.timer(f"sink.{type(sink).__name__}.append"):
+                sink.append(row)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                self.logger.error(f"Unable to close sink {sink.path}: {e}")
+                error = error or e
+        if error is not None:
+            raise error
+
+
+def split_sinks(value, default="excel"):
+    names = [
+        name.strip().lower()
+        for name in (value or default).split(",")
+    ]
+    return [name for name in names if name]
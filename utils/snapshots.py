@@ -0,0 +1,133 @@
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+from .http_search import parse_articles
+
+logger = logging.getLogger("Snapshots")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def snapshot_key(query):
+    return "-".join(query.lower().replace("-", " ").split())
+
+
+class SnapshotArchive():
+    MANIFEST = "manifest.jsonl"
+
+    def __init__(self, root, run=None, logger=logger):
+        self.root = Path(root)
+        self.run = run or datetime.now().strftime("%Y%m%d")
+        self.logger = logger
+
+    def run_dir(self, query, run=None):
+        return self.root / snapshot_key(query) / (run or self.run)
+
+    def save(self, query, page, html, url):
+        directory = self.run_dir(query)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = f"page-{page:05d}.html.gz"
+        partial = directory / f".{name}.{os.getpid()}.part"
+        data = gzip.compress(html.encode("utf-8"))
+        partial.write_bytes(data)
+        os.replace(partial, directory / name)
+        entry = {
+            "page": page,
+            "url": url,
+            "file": name,
+            "bytes": len(data),
+            "captured": datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(directory / self.MANIFEST, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+        self.logger.debug(
+            f"Archived page {page} of {query} ({len(data)} bytes)."
+        )
+        return directory / name
+
+    def runs(self, query):
+        directory = self.root / snapshot_key(query)
+        if not directory.is_dir():
+            return []
+        return sorted(
+            path.name for path in directory.iterdir()
+            if (path / self.MANIFEST).exists()
+        )
+
+    def latest_run(self, query):
+        runs = self.runs(query)
+        return runs[-1] if runs else None
+
+    def entries(self, query, run):
+        manifest = self.run_dir(query, run) / self.MANIFEST
+        if not manifest.exists():
+            return []
+        entries = {}
+        with open(manifest, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entries[entry["page"]] = entry
+        return [entries[page] for page in sorted(entries)]
+
+    def captured(self, query, run):
+        entries = self.entries(query, run)
+        if not entries:
+            raise SnapshotError(f"No snapshots archived for {query!r}.")
+        return datetime.fromisoformat(entries[0]["captured"])
+
+    def pages(self, query, run):
+        directory = self.run_dir(query, run)
+        for entry in self.entries(query, run):
+            path = directory / entry["file"]
+            try:
+                html = gzip.decompress(path.read_bytes()).decode("utf-8")
+            except (OSError, EOFError) as e:
+                self.logger.warning(f"Skipping unreadable {path}: {e}")
+                continue
+            yield entry["page"], entry["url"], html
+
+
+class SnapshotSearchBackend():
+    def __init__(self, archive, run=None, logger=logger):
+        self.archive = archive
+        self.run = run
+        self.logger = logger
+
+    def resolve(self, query):
+        run = self.run or self.archive.latest_run(query)
+        if run is None:
+            raise SnapshotError(f"No snapshots archived for {query!r}.")
+        self.run = run
+        return run
+
+    def search(self, query, start=1, first_page=1, last_page=None):
+        run = self.resolve(query)
+        self.logger.info(f"Reprocessing snapshots of {query!r} from {run}.")
+        seen = set()
+        index = 0
+        for page, url, html in self.archive.pages(query, run):
+            if page < first_page:
+                continue
+            if last_page is not None and page > last_page:
+                break
+            for record in parse_articles(html, url):
+                if record["link"] is None or record["link"] in seen:
+                    continue
+                seen.add(record["link"])
+                index += 1
+                if index < start:
+                    continue
+                record["index"] = index
+                yield record
+
+    def close(self):
+        pass